@@ -187,6 +187,19 @@ const UI_TRANSLATIONS = {
     }
 };
 
+// Overloaded (429) or still warming up (503 "warming"): the backend will translate again soon.
+// A 503 "failed" means the model never loaded, so the external fallback is still worth trying.
+async function translationBusy(response) {
+    if (response.status === 429) return true;
+    if (response.status !== 503) return false;
+    try {
+        const body = await response.clone().json();
+        return body.status === 'warming';
+    } catch (error) {
+        return false;
+    }
+}
+
 function App() {
     const [formData, setFormData] = useState({
         age: '',
@@ -253,23 +266,53 @@ function App() {
                 ...scheme.documents
             ];
 
+            const catalogTexts = [
+                scheme.name,
+                scheme.benefit,
+                scheme.category,
+                scheme.scheme_type || 'Central Government',
+                ...scheme.documents
+            ];
+
             console.log('Translating', textsToTranslate.length, 'texts for scheme:', scheme.id);
 
             // Try local backend first
             try {
-                const response = await fetch(`${API_URL}/translate/batch`, {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({
-                        texts: textsToTranslate,
-                        target_lang: selectedLanguage
+                // Eligibility reasons are rendered from translated templates on the backend
+                const [response, reasonsResponse] = await Promise.all([
+                    fetch(`${API_URL}/translate/batch`, {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({
+                            texts: catalogTexts,
+                            target_lang: selectedLanguage
+                        })
+                    }),
+                    fetch(`${API_URL}/translate/reasons`, {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({
+                            reasons: scheme.eligibility_status.reason_templates,
+                            target_lang: selectedLanguage
+                        })
                     })
-                });
+                ]);
+
+                // Overloaded or warming up: show English now instead of translating string by string
+                const [busy, reasonsBusy] = await Promise.all([
+                    translationBusy(response),
+                    translationBusy(reasonsResponse)
+                ]);
+                if (busy || reasonsBusy) {
+                    console.log('Translation backend busy, showing English for:', scheme.id);
+                    return scheme;
+                }
 
-                if (response.ok) {
+                if (response.ok && reasonsResponse.ok) {
                     const data = await response.json();
+                    const reasonsData = await reasonsResponse.json();
                     
-                    if (!data.error) {
+                    if (!data.error && !reasonsData.error) {
                         const translations = data.translations.map(t => t.translated);
 
                         let idx = 0;
@@ -281,7 +324,7 @@ function App() {
                             scheme_type: translations[idx++],
                             eligibility_status: {
                                 ...scheme.eligibility_status,
-                                reasons: scheme.eligibility_status.reasons.map(() => translations[idx++])
+                                reasons: reasonsData.translations
                             },
                             documents: scheme.documents.map(() => translations[idx++])
                         };
@@ -1,12 +1,38 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, has_request_context, request, jsonify, stream_with_context
 from flask_cors import CORS
 import json
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
-import torch
-from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
 import hashlib
 import secrets
 import os
+import selectors
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, Future, TimeoutError as FutureTimeoutError, as_completed, wait
+
+from eligibility_reasons import REASON_TEMPLATES, ReasonTranslator, protected_template, reason, render_english
+from translation_breaker import CircuitBreaker, Untranslated
+from translation_cache import TranslationCache, make_cache_key
+from translation_glossary import Glossary
+from translation_jobs import TranslationJobManager, parse_jsonl
+from translation_scheduler import PRIORITY_BULK, PRIORITY_INTERACTIVE, DeadlineExceeded, MicroBatcher, QueueFull
+from translation_snapshot import describe_memory, memory_usage
+from translation_swap import ModelSwapper, SwapInProgress
+from translation_text import DEFAULT_SEGMENT_MAX_WORDS, join_segments, per_text_languages, split_sentences
+from translation_warmup import run_warmup, warmup_batches
+from scheme_translations import SUPPORTED_LANGUAGES, SchemeTranslationTable, collect_scheme_strings
+from translation_config import (
+    GENERATION_PROFILES,
+    GENERATION_SETTINGS,
+    TRANSLATION_BACKEND,
+    TRANSLATION_MODEL_DIR,
+    TRANSLATION_PRECISION,
+    auto_profile,
+    build_translation_backend,
+)
 
 app = Flask(__name__)
 CORS(app)
@@ -35,21 +61,274 @@ def generate_token():
     """Generate a random token"""
     return secrets.token_hex(32)
 
-translation_model = None
-translation_tokenizer = None
+# Active translation backend (see translation_backends.py)
+translation_backend = None
+
+# Pool replicas (translation_pool.py) are spawned processes that re-import the script
+# that started the app as __mp_main__. They only load a backend, so they skip the
+# SQLite cache and the model loader below.
+TRANSLATION_REPLICA_PROCESS = __name__ == '__mp_main__'
+
+# Default profile per endpoint: a profile name, or "auto" to choose by input length
+TRANSLATION_PROFILE = os.environ.get('TRANSLATION_PROFILE', 'auto')
+TRANSLATION_BATCH_PROFILE = os.environ.get('TRANSLATION_BATCH_PROFILE', 'auto')
+
+# Translation cache (in-memory LRU backed by SQLite)
+translation_cache = TranslationCache(
+    db_path=None if TRANSLATION_REPLICA_PROCESS else os.environ.get('TRANSLATION_CACHE_DB', 'translation_cache.db') or None,
+    max_entries=int(os.environ.get('TRANSLATION_CACHE_MAX_ENTRIES', 10000)),
+    max_bytes=int(os.environ.get('TRANSLATION_CACHE_MAX_BYTES', 16 * 1024 * 1024)),
+    max_disk_entries=int(os.environ.get('TRANSLATION_CACHE_MAX_DISK_ENTRIES', 500000)) or None,
+    disk_ttl_seconds=float(os.environ.get('TRANSLATION_CACHE_DISK_TTL_DAYS', 0)) * 86400 or None,
+)
+
+def batch_profile(name, backend):
+    """
+    Scheduler profile of texts translated with a generation profile on a backend.
+    
+    Texts queued before a model swap stay on the backend their cache keys were made for.
+    """
+    return (name, backend)
+
+def generate_translations(texts, target_lang, profile=None, on_bucket=None):
+    """
+    Run a translation backend on English texts (one target language or one per text).
+    
+    profile is a generation profile name for the active backend, or a batch_profile().
+    """
+    name, backend = profile if isinstance(profile, tuple) else (profile, translation_backend)
+    settings = GENERATION_PROFILES.get(name, GENERATION_SETTINGS)
+    langs = per_text_languages(target_lang, len(texts))
+    masked = [translation_glossary.mask(text, lang) for text, lang in zip(texts, langs)]
+    
+    def restore(index, translated):
+        restore_map = masked[index][1]
+        return translation_glossary.unmask(translated, restore_map, langs[index]) if restore_map else translated
+    
+    def deliver(indices, translated):
+        # Items whose protected terms were lost are delivered after the retry below
+        ready = [(i, restore(i, text)) for i, text in zip(indices, translated)]
+        ready = [(i, text) for i, text in ready if text is not None]
+        if ready:
+            on_bucket([i for i, _ in ready], [text for _, text in ready])
+    
+    results = backend.translate_batch(
+        [text for text, _ in masked], langs, settings, deliver if on_bucket else None
+    )
+    results = [restore(i, text) for i, text in enumerate(results)]
+    
+    # Translate texts whose masking failed once more without masks
+    retry = [i for i, text in enumerate(results) if text is None]
+    if retry:
+        for i, text in zip(retry, backend.translate_batch(
+            [texts[i] for i in retry], [langs[i] for i in retry], settings
+        )):
+            results[i] = text
+    return results
+
+# Concurrent requests share model calls through the micro-batching scheduler
+translation_batcher = MicroBatcher(
+    generate_translations,
+    max_wait_ms=float(os.environ.get('TRANSLATION_BATCH_MAX_WAIT_MS', 10)),
+    max_batch_tokens=int(os.environ.get('TRANSLATION_BATCH_MAX_TOKENS', 4096)),
+    # Admission control: shed load with 429 instead of queueing without bound
+    max_queue_items=int(os.environ.get('TRANSLATION_QUEUE_MAX_ITEMS', 2048)) or None,
+    max_queue_wait_ms=float(os.environ.get('TRANSLATION_QUEUE_MAX_WAIT_MS', 5000)) or None,
+)
+# Interactive texts are scheduled to finish within this budget; bulk work has no deadline
+TRANSLATION_INTERACTIVE_SLO_MS = float(os.environ.get('TRANSLATION_INTERACTIVE_SLO_MS', 2000))
+
+def lane_deadline(priority, expires=None):
+    """Scheduler deadline for work submitted now at this priority (never after expires)"""
+    deadline = None
+    if priority == PRIORITY_INTERACTIVE and TRANSLATION_INTERACTIVE_SLO_MS:
+        deadline = time.monotonic() + TRANSLATION_INTERACTIVE_SLO_MS / 1000.0
+    if expires is not None:
+        deadline = expires if deadline is None else min(deadline, expires)
+    return deadline
+
+# How long a request's translations may take: X-Request-Deadline-Ms header or this default
+TRANSLATION_REQUEST_DEADLINE_MS = float(os.environ.get('TRANSLATION_REQUEST_DEADLINE_MS', 30000))
+
+class ClientDisconnected(Exception):
+    """The client of the current request closed its connection"""
+
+def request_deadline():
+    """time.monotonic() deadline of the current request, or None outside a request"""
+    if not has_request_context():
+        return None
+    if 'translation_deadline' not in g:
+        budget_ms = TRANSLATION_REQUEST_DEADLINE_MS
+        try:
+            requested = float(request.headers.get('X-Request-Deadline-Ms') or 0)
+        except ValueError:
+            requested = 0
+        # Clients may ask for less time than the server allows, never more or none
+        if requested > 0:
+            budget_ms = min(requested, budget_ms) if budget_ms else requested
+        g.translation_deadline = time.monotonic() + budget_ms / 1000.0 if budget_ms else None
+    return g.translation_deadline
+
+def client_disconnected():
+    """True once the client of the current request has closed its connection (werkzeug or gunicorn)"""
+    if not has_request_context():
+        return False
+    sock = request.environ.get('werkzeug.socket') or request.environ.get('gunicorn.socket')
+    if sock is None:
+        return False
+    try:
+        # selectors, unlike select.select, handles descriptors above FD_SETSIZE
+        with selectors.DefaultSelector() as selector:
+            selector.register(sock, selectors.EVENT_READ)
+            readable = selector.select(0)
+        # A closed connection is readable with nothing left to read
+        return bool(readable) and sock.recv(1, socket.MSG_PEEK) == b''
+    except (OSError, ValueError):
+        # The probe failed (SSL sockets refuse MSG_PEEK); keep serving the client
+        return False
+
+def await_translations(futures, pending, deadline):
+    """
+    Wait for a request's futures, giving up when its deadline passes or
+    its client disconnects. The pending model futures are then released,
+    so queued texts nobody else waits for are never translated.
+    """
+    remaining = set(futures)
+    while remaining:
+        timeout = 0.25 if deadline is None else min(0.25, deadline - time.monotonic())
+        if timeout > 0:
+            done, remaining = wait(remaining, timeout=timeout, return_when=FIRST_EXCEPTION)
+            failed = next((future for future in done if not future.cancelled() and future.exception()), None)
+            if failed is not None:
+                translation_batcher.release(pending.values())
+                raise failed.exception()
+            if not remaining:
+                break
+        
+        gone = client_disconnected()
+        if gone or (deadline is not None and time.monotonic() >= deadline):
+            translation_batcher.release(pending.values())
+            with _translation_counters_lock:
+                translation_counters["disconnected_requests" if gone else "expired_requests"] += 1
+            if gone:
+                raise ClientDisconnected("Client disconnected")
+            raise DeadlineExceeded("Translation deadline exceeded")
+    return [future.result() for future in futures]
+
+# Serve English instead of waiting on the model while its latency or error rate is too high
+TRANSLATION_BREAKER_LATENCY_MS = float(os.environ.get('TRANSLATION_BREAKER_LATENCY_MS', 3000))
+TRANSLATION_BREAKER_PROBE_TEXT = "Check your eligibility for government schemes"
+
+def probe_translation():
+    """One real model call, used to decide when the breaker can close"""
+    with using_translation_backend() as backend:
+        translation_batcher.translate(
+            [TRANSLATION_BREAKER_PROBE_TEXT], 'hin_Deva',
+            profile=batch_profile(auto_profile(TRANSLATION_BREAKER_PROBE_TEXT), backend),
+            timeout=TRANSLATION_BREAKER_LATENCY_MS / 1000.0
+        )
+
+translation_breaker = CircuitBreaker(
+    probe_translation,
+    window=int(os.environ.get('TRANSLATION_BREAKER_WINDOW', 100)),
+    min_samples=int(os.environ.get('TRANSLATION_BREAKER_MIN_SAMPLES', 20)),
+    failure_ratio=float(os.environ.get('TRANSLATION_BREAKER_FAILURE_RATIO', 0.5)),
+    latency_ms=TRANSLATION_BREAKER_LATENCY_MS,
+    probe_seconds=float(os.environ.get('TRANSLATION_BREAKER_PROBE_SECONDS', 10)),
+    enabled=os.environ.get('TRANSLATION_BREAKER', '1') == '1',
+)
+
+def record_outcome(futures, started):
+    """
+    Report one interactive request's model work to the breaker once all of
+    its futures are done: the wait for the slowest, and whether any failed.
+    
+    One sample per request, so a single large request cannot trip the breaker on its own.
+    """
+    if not futures:
+        return
+    lock = threading.Lock()
+    remaining = [len(futures)]
+    
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        finished = [future for future in futures if not future.cancelled()]
+        if finished:
+            failed = any(future.exception() is not None for future in finished)
+            translation_breaker.record(time.monotonic() - started, failed)
+    
+    for future in futures:
+        future.add_done_callback(done)
+
+def breaker_fallback(texts, priority):
+    """
+    English originals for texts that would need the model while the breaker is open.
+    
+    Bulk work is not given English; it is refused with QueueFull so jobs back off and retry.
+    """
+    if priority != PRIORITY_INTERACTIVE:
+        raise QueueFull(
+            f"Translation is paused: {translation_breaker.reason}",
+            retry_after=max(1, int(translation_breaker.probe_seconds))
+        )
+    translation_breaker.fallback(len(texts))
+    return [Untranslated(text) for text in texts]
+
+# Curated glossary: exact matches skip the model, protected terms are masked during translation
+TRANSLATION_GLOSSARY_FILE = os.environ.get('TRANSLATION_GLOSSARY_FILE', 'translation_glossary.json')
+translation_glossary = Glossary.load(TRANSLATION_GLOSSARY_FILE)
+
+# Model loading mode: "background" (default) loads on a thread at startup,
+# "lazy" waits for the first translation request, "eager" blocks import
+TRANSLATION_LOAD_MODE = os.environ.get('TRANSLATION_LOAD_MODE', 'background').lower()
+
+translation_status = {"state": "not_loaded", "error": None, "load_seconds": None}
+_translation_load_lock = threading.Lock()
+
+def translation_model_version(backend=None):
+    """Identifies the active (or given) engine and weights, and glossary masking, in cache keys"""
+    backend = backend or translation_backend
+    if translation_glossary.protected_terms:
+        return f"{backend.version}+glossary:{translation_glossary.version}"
+    return backend.version
 
 def initialize_translation():
-    global translation_model, translation_tokenizer
+    """Load the model and warm it up; translation is reported ready only after both"""
+    translation_status.update(state="loading", error=None)
+    started = time.time()
+    backend = None
     try:
-        model_name = "ai4bharat/indictrans2-en-indic-1B"
-        translation_tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
-        translation_model = AutoModelForSeq2SeqLM.from_pretrained(model_name, trust_remote_code=True)
-        print("Translation model loaded successfully")
+        backend = build_translation_backend().load()
+        translation_status.update(state="warming", load_seconds=round(time.time() - started, 2))
+        print(f"Translation model loaded in {translation_status['load_seconds']}s ({backend.version}), warming up")
+        try:
+            translation_status["warmup"] = warm_translation_backend(backend)
+        except Exception as e:
+            # Warm-up is best effort: a model that loaded fine still serves, only colder
+            translation_status["warmup"] = {"error": str(e)}
+            print(f"Translation warm-up failed, serving without it: {e}")
+        activate_translation_backend(backend)
+        print(f"Translation model ready after {time.time() - started:.2f}s; "
+              f"{describe_memory(translation_status['memory'])}")
     except Exception as e:
+        if backend is not None and backend is not translation_backend:
+            # Free what did load (a pool's replica processes included)
+            backend.close()
+        translation_status.update(state="failed", error=str(e))
         print(f"Error loading translation model: {e}")
         print("Translation features will be disabled")
 
-initialize_translation()
+def start_translation_loading():
+    """Load the translation model on a background thread (only once)"""
+    with _translation_load_lock:
+        if translation_status["state"] != "not_loaded":
+            return
+        translation_status["state"] = "loading"
+        threading.Thread(target=initialize_translation, name="translation-loader", daemon=True).start()
+
 
 # Comprehensive scheme database
 SCHEMES_DATABASE = {
@@ -596,51 +875,53 @@ def check_eligibility(user_profile, scheme):
     if "age_min" in eligibility:
         if user_profile.get("age", 0) < eligibility["age_min"]:
             eligible = False
-            reasons.append(f"Age must be at least {eligibility['age_min']} years")
+            reasons.append(reason("age_min", age=eligibility["age_min"]))
     
     if "age_max" in eligibility:
         if user_profile.get("age", 100) > eligibility["age_max"]:
             eligible = False
-            reasons.append(f"Age must be below {eligibility['age_max']} years")
+            reasons.append(reason("age_max", age=eligibility["age_max"]))
     
     # Check income
     if "income" in eligibility and eligibility["income"] > 0:
         if user_profile.get("annual_income", 0) > eligibility["income"]:
             eligible = False
-            reasons.append(f"Annual income must be below ₹{eligibility['income']:,}")
+            reasons.append(reason("income_max", amount=eligibility["income"]))
     
     # Check gender
     if "gender" in eligibility:
         if user_profile.get("gender", "").lower() != eligibility["gender"]:
             eligible = False
-            reasons.append(f"Only available for {eligibility['gender']} applicants")
+            reasons.append(reason("gender", gender=eligibility["gender"]))
     
     # Check occupation
     if "occupation" in eligibility:
         user_occupation = user_profile.get("occupation", "").lower()
         if user_occupation not in eligibility["occupation"]:
             eligible = False
-            reasons.append(f"Only for {', '.join(eligibility['occupation'])}")
+            reasons.append(reason("occupation", occupations=eligibility["occupation"]))
     
     # Check category
     if "category" in eligibility:
         user_category = user_profile.get("category", "").lower()
         if user_category not in eligibility["category"]:
             eligible = False
-            reasons.append(f"Only for {', '.join(eligibility['category'])} categories")
+            reasons.append(reason("category", categories=eligibility["category"]))
     
     # Check state for state schemes
     if "state" in eligibility:
         if user_profile.get("state", "") != eligibility["state"]:
             eligible = False
-            reasons.append(f"Only for {eligibility['state']} residents")
+            reasons.append(reason("state", state=eligibility["state"]))
     
     if eligible:
-        reasons.append("All eligibility criteria met")
+        reasons.append(reason("all_met"))
     
+    # English sentences for display, templates for translation (/api/translate/reasons)
     return {
         "eligible": eligible,
-        "reasons": reasons
+        "reasons": [render_english(item) for item in reasons],
+        "reason_templates": reasons
     }
 
 def calculate_priority_score(user_profile, scheme, eligibility_result):
@@ -675,7 +956,23 @@ def calculate_priority_score(user_profile, scheme, eligibility_result):
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "timestamp": datetime.now().isoformat()})
+    return jsonify({
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "translation": translation_status["state"]
+    })
+
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: 503 until the translation model is loaded and warmed up"""
+    state = translation_status["state"]
+    if state == "ready":
+        return jsonify({"status": "ready", "warmup": translation_status.get("warmup")})
+    
+    response = jsonify({"status": state, "detail": translation_status["error"]})
+    if state != "failed":
+        response.headers['Retry-After'] = '5'
+    return response, 503
 
 # Authentication Endpoints
 @app.route('/api/auth/register', methods=['POST'])
@@ -953,57 +1250,498 @@ def get_scheme_details(scheme_id):
     
     return jsonify({"error": "Scheme not found"}), 404
 
+# Precomputed catalog translations (built offline with `python scheme_translations.py build`)
+SCHEME_TRANSLATIONS_FILE = os.environ.get('SCHEME_TRANSLATIONS_FILE', 'scheme_translations.json')
+scheme_translation_table = SchemeTranslationTable.load(SCHEME_TRANSLATIONS_FILE)
+if scheme_translation_table.languages:
+    print(f"Loaded scheme translation table {scheme_translation_table.metadata.get('version')}")
+    if scheme_translation_table.is_stale(SCHEMES_DATABASE):
+        print("Scheme catalog changed since the table was built; new strings will use the model")
+
+# Long texts are translated sentence by sentence; longer sentences are split at clauses
+TRANSLATION_SEGMENT_MAX_WORDS = int(os.environ.get('TRANSLATION_SEGMENT_MAX_WORDS', DEFAULT_SEGMENT_MAX_WORDS))
+
+translation_counters = {
+    "texts": 0, "unique_texts": 0, "model_texts": 0, "split_texts": 0, "segments": 0, "glossary_hits": 0,
+    "shed_requests": 0, "expired_requests": 0, "disconnected_requests": 0,
+}
+_translation_counters_lock = threading.Lock()
+
+def _resolved(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+def segment_texts(texts, whole=()):
+    """
+    Split every text into sentences: (flat list of segments, [(start, end, separators)] per text).
+    
+    Texts in whole (e.g. catalog strings with a precomputed translation) are kept as one segment.
+    """
+    segments, layout = [], []
+    for text in texts:
+        if text in whole:
+            pieces, separators = [text], ["", ""]
+        else:
+            pieces, separators = split_sentences(text, TRANSLATION_SEGMENT_MAX_WORDS)
+        layout.append((len(segments), len(segments) + len(pieces), separators))
+        segments.extend(pieces)
+    
+    with _translation_counters_lock:
+        translation_counters["texts"] += len(texts)
+        translation_counters["unique_texts"] += len(set(texts))
+        translation_counters["split_texts"] += sum(1 for start, end, _ in layout if end - start > 1)
+        translation_counters["segments"] += len(segments)
+    return segments, layout
+
+def _joined(futures, separators):
+    """Future for a whole text that resolves once all of its sentence futures have"""
+    if len(futures) == 1:
+        return futures[0]
+    
+    joined = Future()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+    
+    def land(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] or joined.done():
+                return
+        try:
+            parts = [future.result() for future in futures]
+            text = join_segments(parts, separators)
+            # One sentence served in English makes the whole text untranslated
+            joined.set_result(Untranslated(text) if any(isinstance(part, Untranslated) for part in parts) else text)
+        except Exception as e:
+            joined.set_exception(e)
+    
+    for future in futures:
+        future.add_done_callback(land)
+    return joined
+
+def submit_translations(texts, target_lang, profile='auto', priority=PRIORITY_INTERACTIVE, expires=None):
+    """
+    Answer texts from the catalog table and cache, and queue the rest.
+    
+    Long texts are split into sentences first; each sentence is looked up,
+    batched and cached on its own and the sentences are joined back in order.
+    
+    Returns (futures, pending): one Future per input text (already resolved
+    for table and cache hits; duplicates share a Future) and the model
+    Futures by cache key, to be stored with store_translations. Texts still
+    queued at expires (a time.monotonic() value) are dropped.
+    """
+    whole = scheme_translation_table.lookup_many(texts, target_lang)
+    segments, layout = segment_texts(texts, whole=whole)
+    # Texts were looked up in the table above; only the sentences of split texts are new lookups
+    known = {text: whole.get(text) for text in texts}
+    futures, pending = _submit_segments(segments, target_lang, profile, priority, expires, known)
+    return [_joined(futures[start:end], separators) for start, end, separators in layout], pending
+
+def _submit_segments(texts, target_lang, profile, priority, expires=None, known=None):
+    """
+    submit_translations for texts that are already split into sentences.
+    
+    known maps texts already looked up in the catalog table to their translation (None if missing).
+    """
+    known = known or {}
+    table_hits = {text: translated for text, translated in known.items() if translated is not None}
+    table_hits.update(scheme_translation_table.lookup_many([text for text in texts if text not in known], target_lang))
+    # Curated glossary first, then the precomputed catalog table
+    glossary_hits = translation_glossary.lookup_many(texts, target_lang)
+    table_hits.update(glossary_hits)
+    with _translation_counters_lock:
+        translation_counters["glossary_hits"] += sum(1 for text in texts if text in glossary_hits)
+    if len(table_hits) == len(texts):
+        return [_resolved(table_hits[text]) for text in texts], {}
+    
+    profiles = [auto_profile(text) if profile == 'auto' else profile for text in texts]
+    # Keys and queued work refer to the same backend even if a model swap happens meanwhile
+    with using_translation_backend() as backend:
+        version = translation_model_version(backend)
+        keys = [
+            make_cache_key(text, target_lang, version, GENERATION_PROFILES[name])
+            for text, name in zip(texts, profiles)
+        ]
+        cached = translation_cache.get_many(
+            list(dict.fromkeys(key for key, text in zip(keys, texts) if text not in table_hits))
+        )
+        for key, text in zip(keys, texts):
+            if text in table_hits:
+                cached[key] = table_hits[text]
+        
+        # Only strings missing from the cache reach the model, each unique string once
+        pending_texts = {}
+        for key, text, name in zip(keys, texts, profiles):
+            if key not in cached and key not in pending_texts:
+                pending_texts[key] = (text, name)
+        
+        # While the breaker is open, cache misses are answered in English and never cached
+        if pending_texts and not translation_breaker.allow():
+            fallbacks = breaker_fallback([text for text, _ in pending_texts.values()], priority)
+            cached.update(zip(pending_texts, fallbacks))
+            pending_texts = {}
+        
+        with _translation_counters_lock:
+            translation_counters["model_texts"] += len(pending_texts)
+        
+        # Requests already running the same key share its result (singleflight)
+        pending = {}
+        deadline = lane_deadline(priority, expires)
+        started = time.monotonic()
+        try:
+            for name in set(name for _, name in pending_texts.values()):
+                group = [key for key, (_, item_profile) in pending_texts.items() if item_profile == name]
+                group_futures = translation_batcher.submit(
+                    [pending_texts[key][0] for key in group], target_lang, keys=group,
+                    profile=batch_profile(name, backend), priority=priority, deadline=deadline, expires=expires
+                )
+                pending.update(zip(group, group_futures))
+        except QueueFull:
+            # A refused request leaves nothing queued: drop the groups already submitted
+            translation_batcher.release(pending.values())
+            raise
+    
+    if priority == PRIORITY_INTERACTIVE:
+        record_outcome(list(pending.values()), started)
+    
+    futures = {key: _resolved(value) for key, value in cached.items()}
+    futures.update(pending)
+    return [futures[key] for key in keys], pending
+
+def store_translations(pending):
+    """Write finished model translations to the cache"""
+    fresh = {
+        key: future.result()
+        for key, future in pending.items()
+        if future.done() and not future.cancelled() and future.exception() is None
+    }
+    translation_cache.set_many(fresh)
+
+def translate_texts(texts, target_lang, profile='auto', priority=PRIORITY_INTERACTIVE):
+    """
+    Translate texts, answering catalog and repeated strings without the model.
+    
+    Interactive calls made while serving a request follow its deadline and
+    stop waiting if the client disconnects.
+    """
+    expires = request_deadline() if priority == PRIORITY_INTERACTIVE else None
+    futures, pending = submit_translations(texts, target_lang, profile, priority, expires)
+    try:
+        return await_translations(futures, pending, expires)
+    finally:
+        store_translations(pending)
+
+def translate_texts_multi(texts, target_langs, profile='auto'):
+    """
+    Translate texts into several languages in one pass.
+    
+    Returns one {target_lang: translation} dict per input text. Texts are split
+    into sentences as in submit_translations; catalog and cache hits are
+    answered per language, and the remaining (sentence, language) pairs are
+    translated together in mixed-language batches.
+    """
+    segments, layout = segment_texts(texts)
+    segment_counts = Counter(segments)
+    unique = list(segment_counts)
+    with _translation_counters_lock:
+        # Every segment is looked up once per language
+        translation_counters["segments"] += len(segments) * (len(target_langs) - 1)
+    profiles = {text: auto_profile(text) if profile == 'auto' else profile for text in unique}
+    # Queued pairs refer to the backend their keys were made for (see _submit_segments)
+    with using_translation_backend() as backend:
+        version = translation_model_version(backend)
+        
+        results = {text: {} for text in unique}
+        missing = {}
+        for lang in target_langs:
+            glossary_hits = translation_glossary.lookup_many(unique, lang)
+            table_hits = {**scheme_translation_table.lookup_many(unique, lang), **glossary_hits}
+            with _translation_counters_lock:
+                translation_counters["glossary_hits"] += sum(
+                    count for text, count in segment_counts.items() if text in glossary_hits
+                )
+            keys = {
+                text: make_cache_key(text, lang, version, GENERATION_PROFILES[profiles[text]])
+                for text in unique if text not in table_hits
+            }
+            cached = translation_cache.get_many(list(keys.values()))
+            for text, translated in table_hits.items():
+                results[text][lang] = translated
+            for text, key in keys.items():
+                if key in cached:
+                    results[text][lang] = cached[key]
+                else:
+                    missing.setdefault(text, []).append(lang)
+        
+        if missing and not translation_breaker.allow():
+            for text, langs in missing.items():
+                for lang, fallback in zip(langs, breaker_fallback([text] * len(langs), PRIORITY_INTERACTIVE)):
+                    results[text][lang] = fallback
+            missing = {}
+        
+        with _translation_counters_lock:
+            translation_counters["model_texts"] += sum(len(langs) for langs in missing.values())
+        
+        # Every missing (sentence, language) pair of a profile goes to the scheduler
+        # at once, so the languages share mixed-language batches
+        by_profile = {}
+        for text, langs in missing.items():
+            by_profile.setdefault(profiles[text], []).extend((text, lang) for lang in langs)
+        submitted = []
+        expires = request_deadline()
+        deadline = lane_deadline(PRIORITY_INTERACTIVE, expires)
+        started = time.monotonic()
+        try:
+            for name, pairs in by_profile.items():
+                keys = [make_cache_key(text, lang, version, GENERATION_PROFILES[name]) for text, lang in pairs]
+                futures = translation_batcher.submit(
+                    [text for text, _ in pairs], [lang for _, lang in pairs], keys=keys,
+                    profile=batch_profile(name, backend), deadline=deadline, expires=expires
+                )
+                submitted.extend(zip(pairs, keys, futures))
+        except QueueFull:
+            # As in _submit_segments: nothing of a refused request stays queued
+            translation_batcher.release([future for _, _, future in submitted])
+            raise
+    
+    futures = [future for _, _, future in submitted]
+    record_outcome(futures, started)
+    translated = await_translations(futures, {key: future for _, key, future in submitted}, expires)
+    fresh = {}
+    for ((text, lang), key, _), value in zip(submitted, translated):
+        results[text][lang] = fresh[key] = value
+    translation_cache.set_many(fresh)
+    
+    def joined(start, end, separators, lang):
+        parts = [results[text][lang] for text in segments[start:end]]
+        text = join_segments(parts, separators)
+        return Untranslated(text) if any(isinstance(part, Untranslated) for part in parts) else text
+    
+    return [
+        {lang: joined(start, end, separators, lang) for lang in target_langs}
+        for start, end, separators in layout
+    ]
+
+# Eligibility reasons are rendered from translated templates (see eligibility_reasons.py)
+reason_translator = ReasonTranslator(
+    lambda texts, target_lang: translate_texts(texts, target_lang, TRANSLATION_BATCH_PROFILE),
+    native_digits=os.environ.get('TRANSLATION_NATIVE_DIGITS', '0') == '1',
+)
+
+# Bulk jobs run through the same cache and scheduler, behind interactive requests
+translation_jobs = TranslationJobManager(
+    lambda texts, target_lang, profile: translate_texts(texts, target_lang, profile, priority=PRIORITY_BULK),
+    chunk_size=int(os.environ.get('TRANSLATION_JOB_CHUNK_SIZE', 64)),
+    max_finished_jobs=int(os.environ.get('TRANSLATION_JOB_HISTORY', 100)),
+)
+TRANSLATION_JOB_MAX_TEXTS = int(os.environ.get('TRANSLATION_JOB_MAX_TEXTS', 100000))
+
+# Admin endpoints (model swaps) require this X-Admin-Token; unset disables them
+TRANSLATION_ADMIN_TOKEN = os.environ.get('TRANSLATION_ADMIN_TOKEN', '')
+
+# Warm-up after every model load (see translation_warmup.py): texts per batch shape and language
+TRANSLATION_WARMUP = os.environ.get('TRANSLATION_WARMUP', '1') == '1'
+TRANSLATION_WARMUP_TEXTS = int(os.environ.get('TRANSLATION_WARMUP_TEXTS', 2))
+TRANSLATION_WARMUP_LANGS = [
+    lang for lang in os.environ.get('TRANSLATION_WARMUP_LANGS', ','.join(SUPPORTED_LANGUAGES)).split(',') if lang
+]
+
+def warm_translation_backend(backend):
+    """
+    Run the warm-up batches on a backend before it serves; None when warm-up is off.
+    
+    Texts use the profiles the endpoints would pick for them. The results are
+    cached under the backend's version, so its first requests find them.
+    """
+    if not TRANSLATION_WARMUP:
+        return None
+    batches = warmup_batches(
+        collect_scheme_strings(SCHEMES_DATABASE),
+        [protected_template(template) for template in REASON_TEMPLATES],
+        TRANSLATION_WARMUP_LANGS,
+        TRANSLATION_WARMUP_TEXTS,
+    )
+    version = translation_model_version(backend)
+    fresh = {}
+    
+    def translate(texts, langs):
+        by_profile = {}
+        for text, lang in zip(texts, langs):
+            # Both endpoint defaults may resolve to the same profile; warm it once
+            names = {auto_profile(text) if profile == 'auto' else profile
+                     for profile in (TRANSLATION_PROFILE, TRANSLATION_BATCH_PROFILE)}
+            for name in names:
+                by_profile.setdefault(name, []).append((text, lang))
+        for name, pairs in by_profile.items():
+            translated = generate_translations(
+                [text for text, _ in pairs], [lang for _, lang in pairs], batch_profile(name, backend)
+            )
+            for (text, lang), value in zip(pairs, translated):
+                fresh[make_cache_key(text, lang, version, GENERATION_PROFILES[name])] = value
+    
+    summary = run_warmup(translate, batches)
+    translation_cache.set_many(fresh)
+    return summary
+
+def activate_translation_backend(backend):
+    """Send new translations to backend; returns the backend it replaces"""
+    global translation_backend
+    with _translation_load_lock:
+        previous, translation_backend = translation_backend, backend
+        translation_batcher.concurrency = backend.max_concurrency
+        translation_status.update(state="ready", error=None, memory=memory_usage())
+    # Reason templates were translated by the previous model
+    reason_translator.clear()
+    return previous
+
+# Requests that took a backend for their cache keys and have not queued their texts on it yet
+_translation_backend_users = Counter()
+
+@contextmanager
+def using_translation_backend():
+    """The active backend, counted as in use (see backend_has_work) until the block ends"""
+    with _translation_load_lock:
+        backend = translation_backend
+        _translation_backend_users[id(backend)] += 1
+    try:
+        yield backend
+    finally:
+        with _translation_load_lock:
+            _translation_backend_users[id(backend)] -= 1
+            if not _translation_backend_users[id(backend)]:
+                del _translation_backend_users[id(backend)]
+
+def backend_has_work(backend):
+    """True while a request is queueing texts for backend or the scheduler holds queued or running ones"""
+    with _translation_load_lock:
+        if _translation_backend_users[id(backend)]:
+            return True
+    return translation_batcher.has_work(lambda profile: isinstance(profile, tuple) and profile[1] is backend)
+
+translation_swapper = ModelSwapper(
+    lambda backend, precision, model_dir: build_translation_backend(backend, precision, model_dir),
+    warm_translation_backend,
+    activate_translation_backend,
+    backend_has_work,
+    options={"backend": TRANSLATION_BACKEND, "precision": TRANSLATION_PRECISION, "model_dir": TRANSLATION_MODEL_DIR},
+    drain_seconds=float(os.environ.get('TRANSLATION_SWAP_DRAIN_SECONDS', 120)),
+)
+
+# Start loading once everything the warm-up uses is defined
+if not TRANSLATION_REPLICA_PROCESS:
+    if TRANSLATION_LOAD_MODE == 'eager':
+        initialize_translation()
+    elif TRANSLATION_LOAD_MODE == 'background':
+        start_translation_loading()
+
+def admin_forbidden():
+    """403 response unless the request carries the admin token, else None"""
+    if not TRANSLATION_ADMIN_TOKEN:
+        return jsonify({"error": "Admin API is disabled (set TRANSLATION_ADMIN_TOKEN)"}), 403
+    if not secrets.compare_digest(request.headers.get('X-Admin-Token', ''), TRANSLATION_ADMIN_TOKEN):
+        return jsonify({"error": "Invalid admin token"}), 403
+    return None
+
+def resolve_profile(data, default):
+    """Profile requested in the JSON body, or the endpoint default; None if unknown"""
+    profile = data.get('profile') or default
+    if profile != 'auto' and profile not in GENERATION_PROFILES:
+        return None
+    return profile
+
+def unknown_profile_response():
+    return jsonify({
+        "error": f"Unknown profile. Choose from: auto, {', '.join(GENERATION_PROFILES)}"
+    }), 400
+
+def valid_target_langs(target_langs):
+    """True for a non-empty list of supported language codes"""
+    return (
+        isinstance(target_langs, list) and bool(target_langs)
+        and all(isinstance(lang, str) and lang in SUPPORTED_LANGUAGES for lang in target_langs)
+    )
+
+def invalid_target_langs_response():
+    return jsonify({
+        "error": f"target_langs must be a list of language codes from: {', '.join(SUPPORTED_LANGUAGES)}"
+    }), 400
+
+def translation_unavailable():
+    """503 response while the model is warming up or failed to load, else None"""
+    state = translation_status["state"]
+    if state == "ready":
+        return None
+    
+    if state == "failed":
+        return jsonify({
+            "error": "Translation model not loaded",
+            "status": "failed",
+            "detail": translation_status["error"]
+        }), 503
+    
+    # In lazy mode the first translation request starts the load
+    start_translation_loading()
+    response = jsonify({"error": "Translation model is warming up", "status": "warming"})
+    response.headers['Retry-After'] = '5'
+    return response, 503
+
+def translation_timed_out(error):
+    """504 response when a request's translation deadline passed"""
+    return jsonify({"error": str(error), "status": "deadline_exceeded"}), 504
+
+def client_gone():
+    """Nobody reads this response; 499 marks it in the access log"""
+    return jsonify({"error": "Client disconnected"}), 499
+
+def translation_overloaded(error):
+    """429 response when the translation queue is shedding load"""
+    with _translation_counters_lock:
+        translation_counters["shed_requests"] += 1
+    response = jsonify({"error": str(error), "status": "overloaded", "retry_after": error.retry_after})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 429
+
 @app.route('/api/translate', methods=['POST'])
 def translate_text():
     """Translate text from English to Indian regional languages"""
     try:
-        if translation_model is None:
-            return jsonify({"error": "Translation model not loaded"}), 503
+        unavailable = translation_unavailable()
+        if unavailable:
+            return unavailable
         
         data = request.json
         text = data.get('text', '')
         target_lang = data.get('target_lang', 'hin_Deva')
         
+        profile = resolve_profile(data, TRANSLATION_PROFILE)
+        
         if not text:
             return jsonify({"error": "No text provided"}), 400
+        if profile is None:
+            return unknown_profile_response()
         
-        src_lang = "eng_Latn"
-        batch = [f"{src_lang} {text}"]
-        
-        inputs = translation_tokenizer(
-            batch,
-            truncation=True,
-            padding="longest",
-            return_tensors="pt",
-            return_attention_mask=True,
-        )
-        
-        with torch.no_grad():
-            generated_tokens = translation_model.generate(
-                **inputs,
-                use_cache=True,
-                min_length=0,
-                max_length=256,
-                num_beams=5,
-                num_return_sequences=1,
-            )
-        
-        with translation_tokenizer.as_target_tokenizer():
-            generated_tokens = translation_tokenizer.batch_decode(
-                generated_tokens.detach().cpu().tolist(),
-                skip_special_tokens=True,
-                clean_up_tokenization_spaces=True,
-            )
-        
-        translated_text = generated_tokens[0]
+        translated_text = translate_texts([text], target_lang, profile)[0]
         
         return jsonify({
             "original": text,
             "translated": translated_text,
+            "untranslated": isinstance(translated_text, Untranslated),
             "source_lang": "English",
-            "target_lang": target_lang
+            "target_lang": target_lang,
+            "profile": profile
         })
     
+    except DeadlineExceeded as e:
+        return translation_timed_out(e)
+    
+    except ClientDisconnected:
+        return client_gone()
+    
+    except QueueFull as e:
+        return translation_overloaded(e)
+    
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1011,55 +1749,375 @@ def translate_text():
 def translate_batch():
     """Translate multiple texts at once"""
     try:
-        if translation_model is None:
-            return jsonify({"error": "Translation model not loaded"}), 503
+        unavailable = translation_unavailable()
+        if unavailable:
+            return unavailable
         
         data = request.json
         texts = data.get('texts', [])
         target_lang = data.get('target_lang', 'hin_Deva')
         
+        profile = resolve_profile(data, TRANSLATION_BATCH_PROFILE)
+        
         if not texts:
             return jsonify({"error": "No texts provided"}), 400
+        if profile is None:
+            return unknown_profile_response()
         
-        src_lang = "eng_Latn"
-        batch = [f"{src_lang} {text}" for text in texts]
+        translations = translate_texts(texts, target_lang, profile)
         
-        inputs = translation_tokenizer(
-            batch,
-            truncation=True,
-            padding="longest",
-            return_tensors="pt",
-            return_attention_mask=True,
-        )
+        return jsonify({
+            "translations": [
+                {"original": orig, "translated": trans, "untranslated": isinstance(trans, Untranslated)}
+                for orig, trans in zip(texts, translations)
+            ],
+            "source_lang": "English",
+            "target_lang": target_lang,
+            "profile": profile
+        })
+    
+    except DeadlineExceeded as e:
+        return translation_timed_out(e)
+    
+    except ClientDisconnected:
+        return client_gone()
+    
+    except QueueFull as e:
+        return translation_overloaded(e)
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/translate/multi', methods=['POST'])
+def translate_multi():
+    """Translate texts into several languages in one call (defaults to every supported language)"""
+    try:
+        unavailable = translation_unavailable()
+        if unavailable:
+            return unavailable
         
-        with torch.no_grad():
-            generated_tokens = translation_model.generate(
-                **inputs,
-                use_cache=True,
-                min_length=0,
-                max_length=256,
-                num_beams=5,
-                num_return_sequences=1,
-            )
+        data = request.json
+        texts = data.get('texts', [])
+        target_langs = data.get('target_langs') or SUPPORTED_LANGUAGES
+        profile = resolve_profile(data, TRANSLATION_BATCH_PROFILE)
         
-        with translation_tokenizer.as_target_tokenizer():
-            generated_tokens = translation_tokenizer.batch_decode(
-                generated_tokens.detach().cpu().tolist(),
-                skip_special_tokens=True,
-                clean_up_tokenization_spaces=True,
-            )
+        if not texts:
+            return jsonify({"error": "No texts provided"}), 400
+        if not valid_target_langs(target_langs):
+            return invalid_target_langs_response()
+        if profile is None:
+            return unknown_profile_response()
+        target_langs = list(dict.fromkeys(target_langs))
+        
+        translations = translate_texts_multi(texts, target_langs, profile)
         
         return jsonify({
             "translations": [
-                {"original": orig, "translated": trans}
-                for orig, trans in zip(texts, generated_tokens)
+                {
+                    "original": orig,
+                    "translated": trans,
+                    "untranslated": [lang for lang, text in trans.items() if isinstance(text, Untranslated)]
+                }
+                for orig, trans in zip(texts, translations)
             ],
             "source_lang": "English",
+            "target_langs": target_langs,
+            "profile": profile
+        })
+    
+    except DeadlineExceeded as e:
+        return translation_timed_out(e)
+    
+    except ClientDisconnected:
+        return client_gone()
+    
+    except QueueFull as e:
+        return translation_overloaded(e)
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/translate/reasons', methods=['POST'])
+def translate_reasons():
+    """Translate structured eligibility reasons (eligibility_status.reason_templates)"""
+    try:
+        unavailable = translation_unavailable()
+        if unavailable:
+            return unavailable
+        
+        data = request.json
+        reasons = data.get('reasons', [])
+        target_lang = data.get('target_lang', 'hin_Deva')
+        
+        if not reasons:
+            return jsonify({"error": "No reasons provided"}), 400
+        
+        try:
+            translations = reason_translator.render(reasons, target_lang)
+        except (KeyError, TypeError, ValueError) as e:
+            return jsonify({"error": f"Invalid reason: {e}"}), 400
+        
+        return jsonify({
+            "translations": translations,
+            "untranslated": [isinstance(text, Untranslated) for text in translations],
+            "source_lang": "English",
             "target_lang": target_lang
         })
     
+    except DeadlineExceeded as e:
+        return translation_timed_out(e)
+    
+    except ClientDisconnected:
+        return client_gone()
+    
+    except QueueFull as e:
+        return translation_overloaded(e)
+    
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/translate/jobs', methods=['POST'])
+def create_translation_job():
+    """Start a background translation job from a JSON body or a JSONL upload"""
+    try:
+        unavailable = translation_unavailable()
+        if unavailable:
+            return unavailable
+        
+        upload = request.files.get('file')
+        if upload is not None or request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+            # Options come from the query string (or form fields next to the file)
+            options = {**request.args.to_dict(), **request.form.to_dict()}
+            if 'target_langs' in options:
+                options['target_langs'] = options['target_langs'].split(',')
+            try:
+                items = parse_jsonl(upload.stream if upload is not None else request.get_data().splitlines())
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+        else:
+            options = request.json or {}
+            items = list(enumerate(options.get('texts', [])))
+        
+        target_langs = options.get('target_langs') or [options.get('target_lang', 'hin_Deva')]
+        profile = resolve_profile(options, TRANSLATION_BATCH_PROFILE)
+        
+        if not items:
+            return jsonify({"error": "No texts provided"}), 400
+        if not valid_target_langs(target_langs):
+            return invalid_target_langs_response()
+        if len(items) > TRANSLATION_JOB_MAX_TEXTS:
+            return jsonify({"error": f"A job can hold at most {TRANSLATION_JOB_MAX_TEXTS} texts"}), 413
+        if profile is None:
+            return unknown_profile_response()
+        
+        job = translation_jobs.submit(items, target_langs, profile)
+        return jsonify({
+            **job.summary(),
+            "status_url": f"/api/translate/jobs/{job.id}",
+            "result_url": f"/api/translate/jobs/{job.id}/result"
+        }), 202
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/translate/jobs', methods=['GET'])
+def list_translation_jobs():
+    """Number of jobs per state; job IDs are not listed, as they grant access to results"""
+    return jsonify({"jobs": translation_jobs.counts()})
+
+@app.route('/api/translate/jobs/<job_id>', methods=['GET'])
+def get_translation_job(job_id):
+    """Progress of a translation job"""
+    job = translation_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.summary())
+
+@app.route('/api/translate/jobs/<job_id>', methods=['DELETE'])
+def cancel_translation_job(job_id):
+    """Cancel a queued or running translation job"""
+    job = translation_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.summary())
+
+@app.route('/api/translate/jobs/<job_id>/result', methods=['GET'])
+def download_translation_job(job_id):
+    """Translations of a finished job as JSONL"""
+    job = translation_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if job.status != "completed":
+        return jsonify({"error": f"Job is {job.status}", **job.summary()}), 409
+    
+    return Response(
+        job.result_lines(),
+        mimetype='application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename="translation-job-{job.id}.jsonl"'}
+    )
+
+@app.route('/api/translate/batch/stream', methods=['POST'])
+def translate_batch_stream():
+    """Stream batch translations as NDJSON (or Server-Sent Events) as they finish"""
+    try:
+        unavailable = translation_unavailable()
+        if unavailable:
+            return unavailable
+        
+        data = request.json
+        texts = data.get('texts', [])
+        target_lang = data.get('target_lang', 'hin_Deva')
+        profile = resolve_profile(data, TRANSLATION_BATCH_PROFILE)
+        
+        if not texts:
+            return jsonify({"error": "No texts provided"}), 400
+        if profile is None:
+            return unknown_profile_response()
+        
+        use_sse = (
+            request.args.get('format') == 'sse'
+            or 'text/event-stream' in request.headers.get('Accept', '')
+        )
+        expires = request_deadline()
+        futures, pending = submit_translations(texts, target_lang, profile, expires=expires)
+    
+    except QueueFull as e:
+        return translation_overloaded(e)
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    
+    def encode(event):
+        payload = json.dumps(event, ensure_ascii=False)
+        return f"data: {payload}\n\n" if use_sse else payload + "\n"
+    
+    def generate():
+        indices = {}
+        for index, future in enumerate(futures):
+            indices.setdefault(future, []).append(index)
+        
+        sent = set()
+        try:
+            # Cache and table hits are already resolved and go out first
+            try:
+                for future in as_completed(indices, timeout=expires - time.monotonic() if expires else None):
+                    sent.add(future)
+                    for index in indices[future]:
+                        event = {"index": index, "original": texts[index]}
+                        if future.exception() is not None:
+                            event["error"] = str(future.exception())
+                        else:
+                            event["translated"] = future.result()
+                            if isinstance(event["translated"], Untranslated):
+                                event["untranslated"] = True
+                        yield encode(event)
+            except FutureTimeoutError:
+                # Deadline passed: stop the remaining work and report it per text
+                translation_batcher.release(pending.values())
+                with _translation_counters_lock:
+                    translation_counters["expired_requests"] += 1
+                for future, future_indices in indices.items():
+                    if future not in sent:
+                        for index in future_indices:
+                            yield encode({"index": index, "original": texts[index], "error": "Translation deadline exceeded"})
+            
+            yield encode({
+                "done": True,
+                "count": len(texts),
+                "source_lang": "English",
+                "target_lang": target_lang,
+                "profile": profile
+            })
+        except GeneratorExit:
+            # The server closes the stream when the client goes away
+            if len(sent) < len(indices):
+                translation_batcher.release(pending.values())
+                with _translation_counters_lock:
+                    translation_counters["disconnected_requests"] += 1
+            raise
+        finally:
+            store_translations(pending)
+    
+    mimetype = 'text/event-stream' if use_sse else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+@app.route('/api/translate/cache/stats', methods=['GET'])
+def translation_cache_stats():
+    """Hit/miss/eviction counters for the translation cache"""
+    return jsonify(translation_cache.stats())
+
+@app.route('/api/admin/translation/swap', methods=['POST'])
+def swap_translation_model():
+    """
+    Load another model version in the background, warm it up and switch traffic to it.
+    
+    Body (all optional): {"backend": "torch", "precision": "int8", "model_dir": "models/..."};
+    omitted fields keep the active model's setting.
+    """
+    forbidden = admin_forbidden()
+    if forbidden:
+        return forbidden
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        options = {name: data.get(name) for name in ("backend", "precision", "model_dir")}
+        if any(value is not None and not isinstance(value, str) for value in options.values()):
+            return jsonify({"error": "backend, precision and model_dir must be strings"}), 400
+        if options["backend"] is not None:
+            options["backend"] = options["backend"].lower()
+        if options["precision"] is not None:
+            options["precision"] = options["precision"].lower()
+        
+        status = translation_swapper.start(**options)
+        return jsonify(status), 202
+    
+    except SwapInProgress as e:
+        return jsonify({"error": str(e), "swap": translation_swapper.stats()}), 409
+    except Exception as e:
+        print(f"Model swap error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/admin/translation/swap', methods=['GET'])
+def get_translation_swap():
+    """Progress of the current or last model swap"""
+    forbidden = admin_forbidden()
+    if forbidden:
+        return forbidden
+    return jsonify(translation_swapper.stats())
+
+@app.route('/api/translate/stats', methods=['GET'])
+def translation_stats():
+    """Cache and batching metrics for the translation pipeline"""
+    with _translation_counters_lock:
+        requests_stats = dict(translation_counters)
+    requests_stats["duplicate_texts"] = requests_stats["texts"] - requests_stats["unique_texts"]
+    # Share of translated strings answered by the glossary without the model
+    requests_stats["glossary_ratio"] = (
+        round(requests_stats["glossary_hits"] / requests_stats["segments"], 4) if requests_stats["segments"] else 0.0
+    )
+    
+    return jsonify({
+        "requests": requests_stats,
+        "cache": translation_cache.stats(),
+        "scheduler": translation_batcher.stats(),
+        "scheme_table": scheme_translation_table.stats(),
+        "reasons": reason_translator.stats(),
+        "glossary": translation_glossary.stats(),
+        "jobs": translation_jobs.stats(),
+        "breaker": translation_breaker.stats(),
+        "model": translation_status,
+        "swap": translation_swapper.stats(),
+        "backend": translation_backend.info() if translation_backend else None
+    })
+
+@app.route('/api/schemes/translations/<target_lang>', methods=['GET'])
+def get_scheme_translations(target_lang):
+    """Precomputed translations of the scheme catalog for one language"""
+    return jsonify({
+        "target_lang": target_lang,
+        "version": scheme_translation_table.metadata.get("version"),
+        "translations": scheme_translation_table.for_language(target_lang)
+    })
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+Translation benchmarks for SevaSahayak
+
+Runs on a fixed sample of scheme strings so results are comparable between
+deployments. Each configuration is loaded in a fresh process so memory
+numbers are not polluted by the previous run (the scaling benchmark starts
+its replica processes from this one).
+
+    python benchmark_translation.py precision
+    python benchmark_translation.py precision --modes fp32 int8 --lang guj_Gujr
+    python benchmark_translation.py backends       # needs TRANSLATION_CT2_MODEL_DIR
+    python benchmark_translation.py tiers
+    python benchmark_translation.py scaling --max-replicas 4
+    python benchmark_translation.py fanout
+    python benchmark_translation.py pipeline
+    python benchmark_translation.py warmup
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import time
+from collections import Counter
+
+# Benchmarks call the model directly; keep app from loading it or touching the cache
+os.environ["TRANSLATION_LOAD_MODE"] = "lazy"
+os.environ["TRANSLATION_CACHE_DB"] = ""
+
+SAMPLE_REASONS = [
+    "Age must be at least 18 years",
+    "Annual income must be below ₹2,00,000",
+    "Only available for female applicants",
+    "Only for farmer, agriculture",
+    "All eligibility criteria met",
+]
+
+
+def sample_texts(limit=None):
+    """Fixed, ordered sample: every catalog string plus typical eligibility reasons"""
+    from app import SCHEMES_DATABASE
+    from scheme_translations import collect_scheme_strings
+
+    texts = collect_scheme_strings(SCHEMES_DATABASE) + SAMPLE_REASONS
+    return texts[:limit] if limit else texts
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _ngrams(tokens, n):
+    return Counter(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+
+def corpus_chrf(hypotheses, references, max_order=6, beta=2):
+    """Character n-gram F-score (chrF), 0-100"""
+    try:
+        import sacrebleu
+        return sacrebleu.corpus_chrf(hypotheses, [references]).score
+    except ImportError:
+        pass
+
+    precisions, recalls = [], []
+    for n in range(1, max_order + 1):
+        matched = hyp_total = ref_total = 0
+        for hyp, ref in zip(hypotheses, references):
+            hyp_grams = _ngrams(list(hyp.replace(" ", "")), n)
+            ref_grams = _ngrams(list(ref.replace(" ", "")), n)
+            matched += sum((hyp_grams & ref_grams).values())
+            hyp_total += sum(hyp_grams.values())
+            ref_total += sum(ref_grams.values())
+        if hyp_total and ref_total:
+            precisions.append(matched / hyp_total)
+            recalls.append(matched / ref_total)
+    if not precisions:
+        return 0.0
+    precision = sum(precisions) / len(precisions)
+    recall = sum(recalls) / len(recalls)
+    if precision + recall == 0:
+        return 0.0
+    return 100 * (1 + beta ** 2) * precision * recall / (beta ** 2 * precision + recall)
+
+
+def corpus_bleu(hypotheses, references, max_order=4):
+    """Whitespace-tokenized corpus BLEU, 0-100"""
+    try:
+        import sacrebleu
+        return sacrebleu.corpus_bleu(hypotheses, [references]).score
+    except ImportError:
+        pass
+
+    matched = [0] * max_order
+    totals = [0] * max_order
+    hyp_length = ref_length = 0
+    for hyp, ref in zip(hypotheses, references):
+        hyp_tokens, ref_tokens = hyp.split(), ref.split()
+        hyp_length += len(hyp_tokens)
+        ref_length += len(ref_tokens)
+        for n in range(1, max_order + 1):
+            hyp_grams = _ngrams(hyp_tokens, n)
+            matched[n - 1] += sum((hyp_grams & _ngrams(ref_tokens, n)).values())
+            totals[n - 1] += sum(hyp_grams.values())
+    if not hyp_length or min(matched) == 0:
+        return 0.0
+    log_precision = sum(math.log(m / t) for m, t in zip(matched, totals)) / max_order
+    brevity = min(0.0, 1 - ref_length / hyp_length)
+    return 100 * math.exp(log_precision + brevity)
+
+
+def _backend_worker(label, backend_name, precision, texts, target_lang, batch_size, runs):
+    """Load one backend configuration and time translations of the sample"""
+    import app
+
+    rss_before = current_rss_mb()
+    started = time.perf_counter()
+    backend = app.build_translation_backend(backend_name, precision).load()
+    load_seconds = time.perf_counter() - started
+    rss_loaded = current_rss_mb()
+
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    backend.translate_batch(batches[0], target_lang)  # warm-up
+
+    latencies, outputs = [], []
+    for run in range(runs):
+        for batch in batches:
+            started = time.perf_counter()
+            translated = backend.translate_batch(batch, target_lang)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if run == 0:
+                outputs.extend(translated)
+
+    return {
+        "label": label,
+        "load_seconds": load_seconds,
+        "model_rss_mb": rss_loaded - rss_before,
+        "peak_rss_mb": current_rss_mb(),
+        "batch_p50_ms": percentile(latencies, 50),
+        "batch_p95_ms": percentile(latencies, 95),
+        "per_text_ms": sum(latencies) / (runs * len(texts)),
+        "outputs": outputs,
+    }
+
+
+def run_in_fresh_process(func, *args):
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+def compare_configurations(configs, args):
+    """Run each (label, backend, precision) and report against the first one"""
+    texts = sample_texts(args.sample)
+    labels = [label for label, _, _ in configs]
+    print(f"Benchmarking {', '.join(labels)} on {len(texts)} scheme strings → {args.lang}")
+
+    results = []
+    for label, backend_name, precision in configs:
+        print(f"   running {label}...")
+        results.append(run_in_fresh_process(
+            _backend_worker, label, backend_name, precision, texts, args.lang, args.batch_size, args.runs
+        ))
+
+    reference = results[0]["outputs"]
+    print()
+    print(f"{'config':<12} {'load s':>7} {'RSS MB':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'ms/text':>8} {'BLEU':>6} {'chrF':>6} {'exact':>6}")
+    for result in results:
+        outputs = result["outputs"]
+        exact = sum(a == b for a, b in zip(outputs, reference)) / len(reference)
+        print(f"{result['label']:<12} {result['load_seconds']:>7.1f} {result['model_rss_mb']:>8.0f} "
+              f"{result['batch_p50_ms']:>8.1f} {result['batch_p95_ms']:>8.1f} {result['per_text_ms']:>8.1f} "
+              f"{corpus_bleu(outputs, reference):>6.1f} {corpus_chrf(outputs, reference):>6.1f} {exact:>6.0%}")
+    print(f"\nBLEU/chrF are measured against the {labels[0]} output of the same sample.")
+
+
+def benchmark_precision(args):
+    modes = ["fp32"] + [mode for mode in args.modes if mode != "fp32"]
+    compare_configurations([(mode, "torch", mode) for mode in modes], args)
+
+
+def benchmark_backends(args):
+    compare_configurations([
+        (f"torch-{args.precision}", "torch", args.precision),
+        ("ctranslate2", "ctranslate2", None),
+    ], args)
+
+
+def _tiers_worker(texts, target_lang, batch_size, runs, backend_name, precision):
+    """Translate the sample with every generation profile using one loaded model"""
+    import app
+
+    backend = app.build_translation_backend(backend_name, precision).load()
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+    def run(settings_for):
+        latencies, outputs = [], []
+        for run_index in range(runs):
+            for batch in batches:
+                groups = {}
+                for index, text in enumerate(batch):
+                    groups.setdefault(settings_for(text), []).append(index)
+                translated = [None] * len(batch)
+                started = time.perf_counter()
+                for name, indices in groups.items():
+                    results = backend.translate_batch(
+                        [batch[i] for i in indices], target_lang, app.GENERATION_PROFILES[name]
+                    )
+                    for i, result in zip(indices, results):
+                        translated[i] = result
+                latencies.append((time.perf_counter() - started) * 1000)
+                if run_index == 0:
+                    outputs.extend(translated)
+        return latencies, outputs
+
+    backend.translate_batch(batches[0], target_lang)  # warm-up
+
+    results = []
+    tiers = [(name, lambda text, name=name: name) for name in app.GENERATION_PROFILES]
+    tiers.append(("auto", app.auto_profile))
+    for label, settings_for in tiers:
+        latencies, outputs = run(settings_for)
+        results.append({
+            "label": label,
+            "batch_p50_ms": percentile(latencies, 50),
+            "batch_p95_ms": percentile(latencies, 95),
+            "per_text_ms": sum(latencies) / (runs * len(texts)),
+            "outputs": outputs,
+        })
+    return results
+
+
+def benchmark_tiers(args):
+    texts = sample_texts(args.sample)
+    print(f"Benchmarking generation profiles on {len(texts)} scheme strings → {args.lang}")
+    results = run_in_fresh_process(
+        _tiers_worker, texts, args.lang, args.batch_size, args.runs, args.backend, args.precision
+    )
+
+    reference = next(result for result in results if result["label"] == "quality")["outputs"]
+    print()
+    print(f"{'profile':<10} {'p50 ms':>8} {'p95 ms':>8} {'ms/text':>8} {'speedup':>8} "
+          f"{'BLEU':>6} {'chrF':>6} {'exact':>6}")
+    quality_ms = next(result for result in results if result["label"] == "quality")["per_text_ms"]
+    for result in results:
+        outputs = result["outputs"]
+        exact = sum(a == b for a, b in zip(outputs, reference)) / len(reference)
+        print(f"{result['label']:<10} {result['batch_p50_ms']:>8.1f} {result['batch_p95_ms']:>8.1f} "
+              f"{result['per_text_ms']:>8.1f} {quality_ms / result['per_text_ms']:>7.1f}x "
+              f"{corpus_bleu(outputs, reference):>6.1f} {corpus_chrf(outputs, reference):>6.1f} {exact:>6.0%}")
+    print("\nAgreement (BLEU/chrF/exact) is measured against the quality profile.")
+
+
+def _scaling_worker(texts, target_lang, batch_size, runs, engine, precision, replicas, threads):
+    """Push the sample through a pool of replicas from concurrent callers"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from translation_config import GENERATION_SETTINGS, TRANSLATION_MODEL_NAME
+    from translation_pool import ReplicaPool
+
+    pool = ReplicaPool(
+        TRANSLATION_MODEL_NAME, GENERATION_SETTINGS, engine=engine, precision=precision,
+        replicas=replicas, threads_per_replica=threads,
+    ).load()
+    try:
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        with ThreadPoolExecutor(max_workers=replicas) as executor:
+            list(executor.map(lambda batch: pool.translate_batch(batch, target_lang), batches[:replicas]))  # warm-up
+
+            started = time.perf_counter()
+            for _ in range(runs):
+                list(executor.map(lambda batch: pool.translate_batch(batch, target_lang), batches))
+            elapsed = time.perf_counter() - started
+    finally:
+        pool.shutdown()
+
+    return {
+        "replicas": replicas,
+        "threads": pool.threads_per_replica,
+        "texts_per_second": runs * len(texts) / elapsed,
+    }
+
+
+def benchmark_scaling(args):
+    texts = sample_texts(args.sample)
+    cores = os.cpu_count() or 1
+    print(f"Benchmarking 1-{args.max_replicas} {args.engine} replicas on {cores} cores, "
+          f"{len(texts)} scheme strings → {args.lang}")
+
+    results = []
+    for replicas in range(1, args.max_replicas + 1):
+        threads = args.threads or max(1, cores // replicas)
+        print(f"   running {replicas} x {threads} threads...")
+        # Runs here: the replicas are fresh processes already, and a daemonic
+        # worker process could not start them
+        results.append(_scaling_worker(
+            texts, args.lang, args.batch_size, args.runs, args.engine, args.precision, replicas, threads,
+        ))
+
+    baseline = results[0]["texts_per_second"]
+    print()
+    print(f"{'replicas':>8} {'threads':>8} {'texts/s':>9} {'speedup':>8}")
+    for result in results:
+        print(f"{result['replicas']:>8} {result['threads']:>8} {result['texts_per_second']:>9.1f} "
+              f"{result['texts_per_second'] / baseline:>7.2f}x")
+
+
+def _fanout_worker(texts, target_langs, batch_size, runs, backend_name, precision):
+    """
+    Time one batch call per language against one mixed-language batch. Both
+    translate the same (text, language) pairs; only the batching differs.
+    """
+    import app
+
+    backend = app.build_translation_backend(backend_name, precision).load()
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    backend.translate_many(batches[0], target_langs)  # warm-up
+
+    def timed(translate):
+        started = time.perf_counter()
+        for _ in range(runs):
+            for batch in batches:
+                translate(batch)
+        return (time.perf_counter() - started) / runs
+
+    separate = timed(lambda batch: [backend.translate_batch(batch, lang) for lang in target_langs])
+    fanout = timed(lambda batch: backend.translate_many(batch, target_langs))
+    return separate, fanout
+
+
+def benchmark_fanout(args):
+    from scheme_translations import SUPPORTED_LANGUAGES
+
+    texts = sample_texts(args.sample)
+    target_langs = args.langs or SUPPORTED_LANGUAGES
+    print(f"Benchmarking batching of {len(texts)} scheme strings x {len(target_langs)} languages "
+          f"(same pairs both ways)")
+    separate, fanout = run_in_fresh_process(
+        _fanout_worker, texts, target_langs, args.batch_size, args.runs, args.backend, args.precision
+    )
+    print()
+    print(f"{'mode':<22} {'seconds':>8} {'ms/text/lang':>13}")
+    per_output = len(texts) * len(target_langs) / 1000
+    print(f"{'one call per language':<22} {separate:>8.2f} {separate / per_output:>13.1f}")
+    print(f"{'mixed-language batch':<22} {fanout:>8.2f} {fanout / per_output:>13.1f}")
+    print(f"\nSpeedup: {separate / fanout:.2f}x")
+
+
+def _pipeline_worker(texts, target_lang, batch_size, runs, backend_name, precision, pipelined):
+    """Sustained throughput of the sample fed through the scheduler, with or without stages"""
+    os.environ["TRANSLATION_PIPELINE"] = "1" if pipelined else "0"
+    import app
+    from translation_scheduler import MicroBatcher
+
+    backend = app.build_translation_backend(backend_name, precision).load()
+    backend.translate_batch(texts[:batch_size], target_lang)  # warm-up
+
+    # Keys make every run real work instead of coalescing with the previous one
+    batcher = MicroBatcher(
+        lambda batch, langs, profile, on_partial: backend.translate_batch(batch, langs, None, on_partial),
+        max_batch_tokens=batch_size * 16, concurrency=backend.max_concurrency,
+    )
+    started = time.perf_counter()
+    for run in range(runs):
+        futures = batcher.submit(texts, target_lang, keys=[(run, i) for i in range(len(texts))])
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - started
+    batcher.shutdown()
+
+    return {
+        "texts_per_second": runs * len(texts) / elapsed,
+        "stages": backend.pipeline.stats() if backend.pipeline else None,
+    }
+
+
+def benchmark_pipeline(args):
+    texts = sample_texts(args.sample)
+    print(f"Benchmarking serial vs. pipelined stages on {len(texts)} scheme strings → {args.lang}")
+    serial = run_in_fresh_process(
+        _pipeline_worker, texts, args.lang, args.batch_size, args.runs, args.backend, args.precision, False
+    )
+    pipelined = run_in_fresh_process(
+        _pipeline_worker, texts, args.lang, args.batch_size, args.runs, args.backend, args.precision, True
+    )
+    print()
+    print(f"{'mode':<10} {'texts/s':>9}")
+    print(f"{'serial':<10} {serial['texts_per_second']:>9.1f}")
+    print(f"{'pipelined':<10} {pipelined['texts_per_second']:>9.1f}")
+    print(f"\nSpeedup: {pipelined['texts_per_second'] / serial['texts_per_second']:.2f}x")
+    print(f"\n{'stage':<10} {'items':>6} {'busy s':>8} {'utilization':>12}")
+    for stage, stats in pipelined["stages"].items():
+        print(f"{stage:<10} {stats['items']:>6} {stats['busy_seconds']:>8.2f} {stats['utilization']:>12.0%}")
+
+
+def _warmup_worker(texts, langs, requests, backend_name, precision, warm):
+    """Latency of single-text requests right after load, with or without the warm-up routine"""
+    import app
+    from translation_warmup import run_warmup, warmup_batches
+
+    backend = app.build_translation_backend(backend_name, precision).load()
+
+    def translate(batch, batch_langs):
+        by_profile = {}
+        for text, lang in zip(batch, batch_langs):
+            by_profile.setdefault(app.auto_profile(text), []).append((text, lang))
+        for name, pairs in by_profile.items():
+            backend.translate_batch(
+                [text for text, _ in pairs], [lang for _, lang in pairs], app.GENERATION_PROFILES[name]
+            )
+
+    warmup = None
+    if warm:
+        batches = warmup_batches(
+            app.collect_scheme_strings(app.SCHEMES_DATABASE),
+            [app.protected_template(template) for template in app.REASON_TEMPLATES],
+            langs,
+            app.TRANSLATION_WARMUP_TEXTS,
+        )
+        warmup = run_warmup(translate, batches)["seconds"]
+
+    # Same shuffled request sequence in both runs
+    order = list(range(len(texts)))
+    random.Random(0).shuffle(order)
+    latencies = []
+    for i in range(requests):
+        started = time.perf_counter()
+        translate([texts[order[i % len(order)]]], [langs[i % len(langs)]])
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    first, steady = latencies[:requests // 2], latencies[requests // 2:]
+    return {
+        "warmup_seconds": warmup,
+        "first_p50_ms": percentile(first, 50),
+        "first_p99_ms": percentile(first, 99),
+        "steady_p50_ms": percentile(steady, 50),
+        "steady_p99_ms": percentile(steady, 99),
+    }
+
+
+def benchmark_warmup(args):
+    from scheme_translations import SUPPORTED_LANGUAGES
+
+    texts = sample_texts(args.sample)
+    langs = args.langs or SUPPORTED_LANGUAGES
+    half = args.requests // 2
+    print(f"Benchmarking the first {half} vs. the next {half} requests after load, "
+          f"{len(texts)} scheme strings x {len(langs)} languages")
+    results = [
+        (label, run_in_fresh_process(
+            _warmup_worker, texts, langs, args.requests, args.backend, args.precision, warm
+        ))
+        for label, warm in (("cold", False), ("warmed", True))
+    ]
+    print()
+    print(f"{'start':<8} {'warm-up s':>9} {'first p50':>10} {'first p99':>10} {'steady p50':>11} {'steady p99':>11}")
+    for label, result in results:
+        warmup = f"{result['warmup_seconds']:.1f}" if result["warmup_seconds"] is not None else "-"
+        print(f"{label:<8} {warmup:>9} {result['first_p50_ms']:>10.1f} {result['first_p99_ms']:>10.1f} "
+              f"{result['steady_p50_ms']:>11.1f} {result['steady_p99_ms']:>11.1f}")
+
+
+def add_sample_arguments(parser):
+    parser.add_argument("--lang", default="hin_Deva")
+    parser.add_argument("--sample", type=int, default=None, help="Limit the number of strings")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--runs", type=int, default=3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SevaSahayak translation benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    precision = subparsers.add_parser("precision", help="Compare fp32, int8 and bf16 inference")
+    precision.add_argument("--modes", nargs="+", default=["fp32", "int8", "bf16"])
+    add_sample_arguments(precision)
+    precision.set_defaults(func=benchmark_precision)
+
+    backends = subparsers.add_parser("backends", help="Compare the torch and ctranslate2 engines")
+    backends.add_argument("--precision", default="fp32", help="Precision of the torch baseline")
+    add_sample_arguments(backends)
+    backends.set_defaults(func=benchmark_backends)
+
+    tiers = subparsers.add_parser("tiers", help="Compare generation profiles (fast, balanced, quality, auto)")
+    tiers.add_argument("--backend", default="torch")
+    tiers.add_argument("--precision", default="fp32")
+    add_sample_arguments(tiers)
+    tiers.set_defaults(func=benchmark_tiers)
+
+    scaling = subparsers.add_parser("scaling", help="Throughput of 1..K replica processes")
+    scaling.add_argument("--max-replicas", type=int, default=4)
+    scaling.add_argument("--threads", type=int, default=None, help="Threads per replica (default: cores / replicas)")
+    scaling.add_argument("--engine", default="torch")
+    scaling.add_argument("--precision", default="fp32")
+    add_sample_arguments(scaling)
+    scaling.set_defaults(func=benchmark_scaling)
+
+    fanout = subparsers.add_parser("fanout", help="One call per language vs. one mixed-language batch")
+    fanout.add_argument("--langs", nargs="+", default=None, help="Target languages (default: all supported)")
+    fanout.add_argument("--backend", default="torch")
+    fanout.add_argument("--precision", default="fp32")
+    add_sample_arguments(fanout)
+    fanout.set_defaults(func=benchmark_fanout)
+
+    pipeline = subparsers.add_parser("pipeline", help="Serial vs. pipelined tokenize/generate/decode stages")
+    pipeline.add_argument("--backend", default="torch")
+    pipeline.add_argument("--precision", default="fp32")
+    add_sample_arguments(pipeline)
+    pipeline.set_defaults(func=benchmark_pipeline)
+
+    warmup = subparsers.add_parser("warmup", help="Latency of the first requests after load, cold vs. warmed up")
+    warmup.add_argument("--langs", nargs="+", default=None, help="Request languages (default: all supported)")
+    warmup.add_argument("--requests", type=int, default=200, help="Requests; the first half is compared to the rest")
+    warmup.add_argument("--backend", default="torch")
+    warmup.add_argument("--precision", default="fp32")
+    add_sample_arguments(warmup)
+    warmup.set_defaults(func=benchmark_warmup)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
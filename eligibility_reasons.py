@@ -0,0 +1,200 @@
+"""
+Structured eligibility reasons for SevaSahayak
+
+check_eligibility emits each reason as a template id plus parameters, e.g.
+{"template": "age_min", "params": {"age": 18}}, instead of a finished
+sentence. A template is translated once per language with its placeholders
+protected, word parameters (genders, occupations, states) are translated as
+short catalog strings, and numbers are formatted for the language at render
+time. A new income threshold is then a dictionary lookup, not a model call.
+"""
+
+import re
+import threading
+
+from translation_breaker import Untranslated
+from translation_text import to_ascii_digits, to_script_digits
+
+# template id -> (English text, {placeholder: kind}); kinds: number, currency, text, list
+REASON_TEMPLATES = {
+    "age_min": ("Age must be at least {age} years", {"age": "number"}),
+    "age_max": ("Age must be below {age} years", {"age": "number"}),
+    "income_max": ("Annual income must be below {amount}", {"amount": "currency"}),
+    "gender": ("Only available for {gender} applicants", {"gender": "text"}),
+    "occupation": ("Only for {occupations}", {"occupations": "list"}),
+    "category": ("Only for {categories} categories", {"categories": "list"}),
+    "state": ("Only for {state} residents", {"state": "text"}),
+    "all_met": ("All eligibility criteria met", {}),
+}
+
+# Placeholders are sent to the model as numbers, which it copies through
+_SENTINEL_BASE = 7001
+
+
+def reason(template, **params):
+    """A structured reason as returned by check_eligibility"""
+    return {"template": template, "params": params}
+
+
+def group_indian(value):
+    """Digits of an integer with Indian grouping: 200000 -> 2,00,000"""
+    digits = str(abs(int(value)))
+    if len(digits) > 3:
+        head, tail = digits[:-3], digits[-3:]
+        head = ",".join(re.findall(r"\d{1,2}", head[::-1]))[::-1]
+        digits = f"{head},{tail}"
+    return f"-{digits}" if int(value) < 0 else digits
+
+
+def format_number(value, kind, target_lang=None, native_digits=False):
+    """Render a numeric parameter for a language (English when target_lang is None)"""
+    text = group_indian(value)
+    if kind == "currency":
+        text = f"₹{text}"
+    if target_lang:
+        text = to_script_digits(text, target_lang, native_digits)
+    return text
+
+
+def render_english(item):
+    """English sentence of a structured reason"""
+    text, kinds = REASON_TEMPLATES[item["template"]]
+    for name, kind in kinds.items():
+        value = item["params"][name]
+        if kind in ("number", "currency"):
+            value = format_number(value, kind)
+        elif kind == "list":
+            value = ", ".join(value)
+        text = text.replace("{" + name + "}", str(value))
+    return text
+
+
+def protected_template(template):
+    """English template with each placeholder replaced by a sentinel number"""
+    text, kinds = REASON_TEMPLATES[template]
+    for index, name in enumerate(kinds):
+        text = text.replace("{" + name + "}", str(_SENTINEL_BASE + index))
+    return text
+
+
+def collect_reason_strings(schemes_database):
+    """Every string translated for reasons: protected templates and word parameters of the catalog"""
+    strings = {protected_template(template) for template in REASON_TEMPLATES}
+    schemes = list(schemes_database["central"])
+    for state, state_schemes in schemes_database["state_schemes"].items():
+        schemes.extend(state_schemes)
+    for scheme in schemes:
+        eligibility = scheme.get("eligibility", {})
+        for field in ("gender", "state"):
+            if eligibility.get(field):
+                strings.add(eligibility[field])
+        for field in ("occupation", "category"):
+            if isinstance(eligibility.get(field), list):
+                strings.update(eligibility[field])
+    return strings
+
+
+class ReasonTranslator:
+    """
+    Renders structured reasons in a target language.
+
+    translate_fn(texts, target_lang) translates English strings (normally
+    through the catalog table, cache and scheduler). Translated templates
+    are kept per language, so after the first request rendering only needs
+    the word parameters, which are short and almost always cached.
+    """
+
+    def __init__(self, translate_fn, native_digits=False):
+        self.translate_fn = translate_fn
+        self.native_digits = native_digits
+        self._templates = {}
+        self._lock = threading.Lock()
+        self._counters = {"rendered": 0, "template_translations": 0, "fallbacks": 0}
+
+    def _unprotect(self, template, translated):
+        """Put placeholders back into a translated template; None if the model lost one"""
+        translated = to_ascii_digits(translated)
+        for index, name in enumerate(REASON_TEMPLATES[template][1]):
+            sentinel = str(_SENTINEL_BASE + index)
+            if translated.count(sentinel) != 1:
+                return None
+            translated = translated.replace(sentinel, "{" + name + "}")
+        return translated
+
+    def render(self, reasons, target_lang):
+        """Translated sentence for each structured reason"""
+        for item in reasons:
+            if item.get("template") not in REASON_TEMPLATES:
+                raise ValueError(f"Unknown reason template: {item.get('template')}")
+
+        # Templates are resolved once per call, so a clear() during a model swap cannot drop them midway
+        with self._lock:
+            known = self._templates
+            templates = {
+                item["template"]: self._templates[(target_lang, item["template"])]
+                for item in reasons if (target_lang, item["template"]) in self._templates
+            }
+        missing = sorted({item["template"] for item in reasons} - templates.keys())
+
+        # Templates not translated yet and word parameters go to the model in one call
+        words = []
+        for item in reasons:
+            for name, kind in REASON_TEMPLATES[item["template"]][1].items():
+                if kind == "text":
+                    words.append(item["params"][name])
+                elif kind == "list":
+                    words.extend(item["params"][name])
+        words = list(dict.fromkeys(str(word) for word in words))
+        protected = [protected_template(template) for template in missing]
+        translated = self.translate_fn(protected + words, target_lang) if protected or words else []
+        word_translations = dict(zip(words, translated[len(protected):]))
+        if any(isinstance(text, Untranslated) for text in translated):
+            # The model is unavailable; keep nothing and answer in English
+            with self._lock:
+                self._counters["rendered"] += len(reasons)
+            return [Untranslated(render_english(item)) for item in reasons]
+
+        for template, text in zip(missing, translated):
+            templates[template] = self._unprotect(template, text)
+        with self._lock:
+            # Not kept if the model was swapped meanwhile: they may come from the old one
+            if self._templates is known:
+                for template in missing:
+                    self._templates[(target_lang, template)] = templates[template]
+            self._counters["template_translations"] += len(missing)
+
+        results, fallbacks = [], []
+        for item in reasons:
+            text = templates[item["template"]]
+            if text is None:
+                # The model dropped a placeholder; translate the full sentence instead
+                fallbacks.append(len(results))
+                results.append(render_english(item))
+                continue
+            for name, kind in REASON_TEMPLATES[item["template"]][1].items():
+                value = item["params"][name]
+                if kind in ("number", "currency"):
+                    value = format_number(value, kind, target_lang, self.native_digits)
+                elif kind == "list":
+                    value = ", ".join(word_translations[str(word)] for word in value)
+                else:
+                    value = word_translations[str(value)]
+                text = text.replace("{" + name + "}", value)
+            results.append(text)
+
+        if fallbacks:
+            for index, text in zip(fallbacks, self.translate_fn([results[i] for i in fallbacks], target_lang)):
+                results[index] = text
+
+        with self._lock:
+            self._counters["rendered"] += len(reasons)
+            self._counters["fallbacks"] += len(fallbacks)
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._templates = {}
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, "templates": len(self._templates), "native_digits": self.native_digits}
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Precomputed translations of the static scheme catalog.
+
+Scheme names, benefits, categories, document names and the eligibility
+reason templates never change between requests, so they are translated once
+by an offline build step and served from a versioned JSON artifact. Only strings missing from the table reach
+the live model.
+
+Build the table (loads the model):
+    python scheme_translations.py build
+    python scheme_translations.py build --langs hin_Deva guj_Gujr
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from eligibility_reasons import collect_reason_strings
+
+TABLE_FORMAT_VERSION = 1
+
+SUPPORTED_LANGUAGES = [
+    "hin_Deva", "guj_Gujr", "pan_Guru", "ben_Beng", "mar_Deva",
+    "tam_Taml", "tel_Telu", "kan_Knda", "mal_Mlym", "ory_Orya",
+]
+
+# Fields of a scheme that are shown to users and translated by the frontend
+TRANSLATABLE_FIELDS = ["name", "benefit", "category"]
+
+
+def collect_scheme_strings(schemes_database):
+    """Return every translatable string of the catalog and its eligibility reasons, sorted and de-duplicated"""
+    strings = {"Central Government"} | collect_reason_strings(schemes_database)
+
+    def add_scheme(scheme):
+        for field in TRANSLATABLE_FIELDS:
+            if scheme.get(field):
+                strings.add(scheme[field])
+        strings.update(scheme.get("documents", []))
+
+    for scheme in schemes_database["central"]:
+        add_scheme(scheme)
+    for state, schemes in schemes_database["state_schemes"].items():
+        strings.add(f"{state} State Government")
+        for scheme in schemes:
+            add_scheme(scheme)
+
+    return sorted(strings)
+
+
+def source_hash(strings):
+    """Fingerprint of the catalog strings, used to spot a stale table"""
+    digest = hashlib.sha256()
+    for text in strings:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+class SchemeTranslationTable:
+    """Read-only {target_lang: {english: translated}} lookup"""
+
+    def __init__(self, languages=None, metadata=None):
+        self.languages = languages or {}
+        self.metadata = metadata or {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """Load a table built by `build`, or return an empty table"""
+        if not path or not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format_version") != TABLE_FORMAT_VERSION:
+            print(f"Ignoring scheme translation table {path}: unsupported format")
+            return cls()
+        metadata = {k: v for k, v in data.items() if k != "languages"}
+        return cls(data.get("languages", {}), metadata)
+
+    def lookup_many(self, texts, target_lang):
+        """Return {text: translation} for the texts present in the table"""
+        table = self.languages.get(target_lang, {})
+        found = {text: table[text] for text in texts if text in table}
+        hits = sum(1 for text in texts if text in found)
+        with self._lock:
+            self.hits += hits
+            self.misses += len(texts) - hits
+        return found
+
+    def for_language(self, target_lang):
+        return self.languages.get(target_lang, {})
+
+    def is_stale(self, schemes_database):
+        """True when the catalog changed since the table was built"""
+        current = source_hash(collect_scheme_strings(schemes_database))
+        return self.metadata.get("source_hash") not in (None, current)
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            "version": self.metadata.get("version"),
+            "model": self.metadata.get("model"),
+            "built_at": self.metadata.get("built_at"),
+            "languages": sorted(self.languages),
+            "entries": sum(len(table) for table in self.languages.values()),
+            "hits": hits,
+            "misses": misses,
+        }
+
+
+def build_table(translate_fn, schemes_database, languages, model_name, generation_settings, batch_size=32):
+    """Translate every catalog string into every language"""
+    strings = collect_scheme_strings(schemes_database)
+    table = {}
+    for lang in languages:
+        translations = []
+        for start in range(0, len(strings), batch_size):
+            translations.extend(translate_fn(strings[start:start + batch_size], lang))
+        table[lang] = dict(zip(strings, translations))
+        print(f"   ✓ {lang}: {len(strings)} strings")
+
+    digest = source_hash(strings)
+    return {
+        "format_version": TABLE_FORMAT_VERSION,
+        "version": f"{digest}-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+        "source_hash": digest,
+        "model": model_name,
+        "generation_settings": generation_settings,
+        "built_at": datetime.now().isoformat(),
+        "languages": table,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute scheme catalog translations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Translate the scheme catalog and write the table")
+    build.add_argument("--output", default=os.environ.get("SCHEME_TRANSLATIONS_FILE", "scheme_translations.json"))
+    build.add_argument("--langs", nargs="+", default=SUPPORTED_LANGUAGES)
+    build.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    # Load the model synchronously here instead of on app's background thread
+    os.environ["TRANSLATION_LOAD_MODE"] = "lazy"
+    # The build translates the whole catalog anyway
+    os.environ["TRANSLATION_WARMUP"] = "0"
+    import app as backend
+
+    backend.initialize_translation()
+    if backend.translation_backend is None:
+        raise SystemExit("Translation model not loaded; cannot build the table")
+
+    print(f"Building scheme translation table for {len(args.langs)} languages...")
+    data = build_table(
+        backend.generate_translations,
+        backend.SCHEMES_DATABASE,
+        args.langs,
+        backend.translation_model_version(),
+        backend.GENERATION_SETTINGS,
+        batch_size=args.batch_size,
+    )
+
+    tmp_path = args.output + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, args.output)
+    print(f"Wrote {args.output} (version {data['version']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Quick test for IndicTrans2 translation functionality
 
 import requests
 import json
+import time
 
 BASE_URL = "http://localhost:5000/api"
 
@@ -82,6 +83,80 @@ def test_translation():
     except Exception as e:
         print(f"   ✗ Error: {e}")
     
+    print("\n4. Testing streaming batch translation...")
+    try:
+        response = requests.post(
+            f"{BASE_URL}/translate/batch/stream",
+            json={
+                "texts": ["Aadhaar", "Bank Account", "All eligibility criteria met"],
+                "target_lang": "hin_Deva"
+            },
+            stream=True,
+            timeout=30
+        )
+        
+        if response.status_code == 200:
+            for line in response.iter_lines():
+                event = json.loads(line)
+                if event.get('done'):
+                    print(f"   ✓ Streamed {event['count']} translations!")
+                else:
+                    print(f"   [{event['index']}] {event['original']} → {event.get('translated')}")
+        else:
+            print(f"   ✗ Error: {response.status_code} - {response.text}")
+    except Exception as e:
+        print(f"   ✗ Error: {e}")
+    
+    print("\n5. Testing one-to-many translation...")
+    try:
+        response = requests.post(
+            f"{BASE_URL}/translate/multi",
+            json={
+                "texts": ["Education Scholarship"],
+                "target_langs": ["hin_Deva", "tam_Taml", "ben_Beng"]
+            },
+            timeout=60
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            for lang, translated in data['translations'][0]['translated'].items():
+                print(f"   • {lang}: {translated}")
+            print("   ✓ One-to-many translation works!")
+        else:
+            print(f"   ✗ Error: {response.status_code} - {response.text}")
+    except Exception as e:
+        print(f"   ✗ Error: {e}")
+    
+    print("\n6. Testing bulk translation job...")
+    try:
+        response = requests.post(
+            f"{BASE_URL}/translate/jobs",
+            json={"texts": ["Apply online", "Ration Card", "Bank Account"], "target_lang": "mar_Deva"},
+            timeout=30
+        )
+        
+        if response.status_code == 202:
+            job_id = response.json()['job_id']
+            for _ in range(60):
+                job = requests.get(f"{BASE_URL}/translate/jobs/{job_id}", timeout=10).json()
+                if job['status'] not in ('queued', 'running'):
+                    break
+                time.sleep(1)
+            print(f"   Status: {job['status']} ({job['progress']['done']}/{job['progress']['total']})")
+            result = requests.get(f"{BASE_URL}/translate/jobs/{job_id}/result", timeout=10)
+            if result.status_code == 200:
+                for line in result.text.splitlines():
+                    record = json.loads(line)
+                    print(f"   • {record['text']} → {record['translated']}")
+                print("   ✓ Bulk translation job works!")
+            else:
+                print(f"   ✗ Error: {result.status_code} - {result.text}")
+        else:
+            print(f"   ✗ Error: {response.status_code} - {response.text}")
+    except Exception as e:
+        print(f"   ✗ Error: {e}")
+    
     print("\n" + "="*60)
     print("Translation Test Complete!")
     print("="*60)
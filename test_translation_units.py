@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the translation building blocks that run without the model:
+scheduler, cache, length buckets, sentence splitting, glossary and breaker.
+
+    python -m pytest -q test_translation_units.py
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import translation_cache
+from translation_backends import plan_buckets
+from translation_breaker import CircuitBreaker
+from translation_cache import TranslationCache
+from translation_glossary import Glossary
+from translation_scheduler import PRIORITY_BULK, DeadlineExceeded, MicroBatcher, QueueFull
+from translation_text import join_segments, split_sentences
+
+
+class GatedModel:
+    """translate_fn for MicroBatcher that records batches and blocks until opened"""
+
+    def __init__(self, blocked=True):
+        self.batches = []
+        self.gate = threading.Event()
+        if not blocked:
+            self.gate.set()
+
+    def __call__(self, texts, langs, profile, on_partial):
+        self.gate.wait(5)
+        self.batches.append(list(texts))
+        return [f"{lang}:{text}" for text, lang in zip(texts, langs)]
+
+
+def occupy(batcher, model):
+    """Submit a blocker and wait until the worker is running it, so later texts stay queued"""
+    batcher.submit(["blocker"], "hin_Deva")
+    deadline = time.monotonic() + 5
+    while batcher.stats()["queued_items"] and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+# Scheduler
+
+def test_identical_texts_share_one_model_call():
+    model = GatedModel()
+    batcher = MicroBatcher(model, max_wait_ms=20)
+    first = batcher.submit(["Healthcare"], "hin_Deva")
+    second = batcher.submit(["Healthcare"], "hin_Deva")
+    model.gate.set()
+
+    assert first[0] is second[0]
+    assert first[0].result(timeout=5) == "hin_Deva:Healthcare"
+    assert model.batches == [["Healthcare"]]
+    assert batcher.stats()["coalesced"] == 1
+
+
+def test_texts_of_one_language_mix_with_others_in_a_batch():
+    model = GatedModel(blocked=False)
+    batcher = MicroBatcher(model, max_wait_ms=50)
+    futures = batcher.submit(["a", "b"], ["hin_Deva", "tam_Taml"])
+    assert [future.result(timeout=5) for future in futures] == ["hin_Deva:a", "tam_Taml:b"]
+    assert model.batches == [["a", "b"]]
+
+
+def test_interactive_lane_runs_before_queued_bulk_work():
+    model = GatedModel()
+    batcher = MicroBatcher(model, max_wait_ms=0, max_batch_tokens=1)
+    occupy(batcher, model)
+    bulk = batcher.submit(["bulk text"], "hin_Deva", priority=PRIORITY_BULK)
+    interactive = batcher.submit(["interactive text"], "hin_Deva")
+    model.gate.set()
+
+    bulk[0].result(timeout=5)
+    interactive[0].result(timeout=5)
+    assert model.batches[1:] == [["interactive text"], ["bulk text"]]
+
+
+def test_full_queue_refuses_new_texts_without_queueing_them():
+    model = GatedModel()
+    batcher = MicroBatcher(model, max_wait_ms=0, max_queue_items=1)
+    occupy(batcher, model)
+    batcher.submit(["queued"], "hin_Deva")
+
+    with pytest.raises(QueueFull):
+        batcher.submit(["one", "two"], "hin_Deva")
+    stats = batcher.stats()
+    assert stats["queued_items"] == 1
+    assert stats["rejected"] == 2
+    model.gate.set()
+
+
+def test_released_texts_are_removed_from_the_queue():
+    model = GatedModel()
+    batcher = MicroBatcher(model, max_wait_ms=0)
+    occupy(batcher, model)
+    kept = batcher.submit(["kept"], "hin_Deva")
+    released = batcher.submit(["released"], "hin_Deva")
+
+    assert batcher.release(released) == 1
+    model.gate.set()
+    assert kept[0].result(timeout=5) == "hin_Deva:kept"
+    assert released[0].cancelled()
+    assert all("released" not in batch for batch in model.batches)
+
+
+def test_shared_text_stays_queued_while_another_caller_waits():
+    model = GatedModel()
+    batcher = MicroBatcher(model, max_wait_ms=0)
+    occupy(batcher, model)
+    first = batcher.submit(["shared"], "hin_Deva")
+    batcher.submit(["shared"], "hin_Deva")
+
+    assert batcher.release(first) == 0
+    model.gate.set()
+    assert first[0].result(timeout=5) == "hin_Deva:shared"
+
+
+def test_expired_texts_are_dropped_before_batching():
+    model = GatedModel()
+    batcher = MicroBatcher(model, max_wait_ms=0)
+    occupy(batcher, model)
+    expired = batcher.submit(["too late"], "hin_Deva", expires=time.monotonic() - 1)
+    model.gate.set()
+
+    with pytest.raises(DeadlineExceeded):
+        expired[0].result(timeout=5)
+    assert all("too late" not in batch for batch in model.batches)
+
+
+def test_deadlines_keep_the_batching_window_for_small_batches():
+    model = GatedModel(blocked=False)
+    batcher = MicroBatcher(model, max_wait_ms=200)
+    batcher.translate(["warm up"], "hin_Deva")
+    # A full batch would take far longer than the deadline on this throughput
+    batcher._tokens_per_second = 100.0
+    model.batches.clear()
+
+    deadline = time.monotonic() + 2
+    futures = batcher.submit(["one"], "hin_Deva", deadline=deadline)
+    futures += batcher.submit(["two"], "hin_Deva", deadline=deadline)
+    [future.result(timeout=5) for future in futures]
+    assert model.batches == [["one", "two"]]
+    assert batcher.stats()["deadline_flushes"] == 0
+
+
+# Cache
+
+def test_memory_tier_evicts_least_recently_used_entries():
+    cache = TranslationCache(max_entries=2)
+    cache.set_many({"a": "1", "b": "2"})
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get_many(["a", "c"]) == {"a": "1", "c": "3"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_memory_tier_is_bounded_by_bytes():
+    cache = TranslationCache(max_entries=100, max_bytes=15)
+    cache.set_many({"k1": "x" * 8, "k2": "y" * 8})
+    assert cache.stats()["memory_entries"] == 1
+    assert cache.get("k2") == "y" * 8
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    TranslationCache(db_path=path).set_many({"key": "अनुवाद"})
+
+    cache = TranslationCache(db_path=path)
+    assert cache.get("key") == "अनुवाद"
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.stats()["disk_entries"] == 1
+
+
+def test_disk_tier_prunes_the_oldest_rows_over_the_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation_cache, "PRUNE_INTERVAL", 10)
+    cache = TranslationCache(db_path=str(tmp_path / "cache.db"), max_disk_entries=15)
+    for batch in range(3):
+        cache.set_many({f"{batch}-{i}": "v" for i in range(10)})
+    cache.clear_memory()
+
+    assert cache.stats()["disk_entries"] == 15
+    assert cache.get("0-0") is None
+    assert cache.get("2-9") == "v"
+
+
+def test_disk_failures_degrade_to_the_memory_tier(tmp_path):
+    cache = TranslationCache(db_path=str(tmp_path / "cache.db"))
+    cache.set("kept", "v")
+    cache._db.execute("DROP TABLE translations")
+    cache.clear_memory()
+
+    assert cache.get_many(["kept"]) == {}
+    cache.set("new", "v")
+    assert cache.get("new") == "v"
+    stats = cache.stats()
+    assert stats["disk_read_errors"] == 1
+    assert stats["disk_write_errors"] == 1
+
+
+def test_locked_database_does_not_fail_writes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = TranslationCache(db_path=path)
+    cache._db.execute("PRAGMA busy_timeout=0")
+    other = sqlite3.connect(path, timeout=0)
+    other.execute("BEGIN EXCLUSIVE")
+    try:
+        cache.set("key", "v")
+    finally:
+        other.rollback()
+        other.close()
+    assert cache.get("key") == "v"
+    assert cache.stats()["disk_write_errors"] == 1
+
+
+# Length buckets
+
+def test_buckets_respect_the_token_budget():
+    buckets = plan_buckets([10] * 10, max_tokens=40)
+    assert [len(bucket) for bucket in buckets] == [4, 4, 2]
+
+
+def test_buckets_split_short_and_long_texts():
+    lengths = [3, 3, 3, 4, 5, 30, 4, 3]
+    buckets = plan_buckets(lengths, max_tokens=1024)
+    assert [[lengths[i] for i in bucket] for bucket in buckets] == [[3, 3, 3, 3, 4, 4, 5], [30]]
+    assert sorted(i for bucket in buckets for i in bucket) == list(range(len(lengths)))
+
+
+# Sentence splitting
+
+def test_long_texts_split_into_sentences_and_join_back():
+    text = "  Apply online. Visit the nearest office!\nBring your Aadhaar card.  "
+    segments, separators = split_sentences(text)
+    assert segments == ["Apply online.", "Visit the nearest office!", "Bring your Aadhaar card."]
+    assert join_segments(segments, separators) == text
+
+
+def test_abbreviations_do_not_end_a_sentence():
+    text = "Documents e.g. ration card are needed. Contact Dr. Rao."
+    segments, _ = split_sentences(text)
+    assert segments == ["Documents e.g. ration card are needed.", "Contact Dr. Rao."]
+
+
+def test_overlong_sentences_split_at_clauses():
+    text = "one two three, four five six; seven eight"
+    segments, separators = split_sentences(text, max_words=3)
+    assert segments == ["one two three,", "four five six;", "seven eight"]
+    assert join_segments(segments, separators) == text
+
+
+def test_short_text_is_left_whole():
+    assert split_sentences("Healthcare") == (["Healthcare"], ["", ""])
+
+
+# Glossary
+
+def glossary():
+    return Glossary(
+        languages={"hin_Deva": {"Healthcare": "स्वास्थ्य सेवा", "Aadhaar": "आधार"}},
+        protected_terms=["Aadhaar", "PM-KISAN"],
+        version="test",
+    )
+
+
+def test_glossary_answers_exact_matches_per_language():
+    assert glossary().lookup_many(["Healthcare", " Aadhaar ", "Other"], "hin_Deva") == {
+        "Healthcare": "स्वास्थ्य सेवा",
+        " Aadhaar ": "आधार",
+    }
+    assert glossary().lookup_many(["Healthcare", "Aadhaar"], "tam_Taml") == {}
+
+
+def test_protected_terms_are_masked_and_restored():
+    terms = glossary()
+    masked, restore = terms.mask("Link Aadhaar to PM-KISAN", "hin_Deva")
+    assert masked == "Link 8101 to PM-KISAN"
+    assert terms.unmask("लिंक ८१०१ करें", restore, "hin_Deva") == "लिंक आधार करें"
+
+
+def test_terms_without_an_entry_are_not_masked():
+    assert glossary().mask("Link Aadhaar", "tam_Taml") == ("Link Aadhaar", {})
+
+
+def test_lost_placeholder_falls_back():
+    terms = glossary()
+    _, restore = terms.mask("Link Aadhaar", "hin_Deva")
+    assert terms.unmask("लिंक करें", restore, "hin_Deva") is None
+    assert terms.stats()["mask_fallbacks"] == 1
+
+
+# Circuit breaker
+
+def test_breaker_opens_when_enough_requests_are_slow_or_fail():
+    breaker = CircuitBreaker(window=10, min_samples=4, failure_ratio=0.5, latency_ms=100)
+    breaker.record(0.01)
+    breaker.record(0.5)
+    breaker.record(0.01, failed=True)
+    assert breaker.allow()
+
+    breaker.record(0.01)
+    assert not breaker.allow()
+    assert breaker.stats()["trips"] == 1
+
+
+def test_breaker_stays_closed_while_requests_are_healthy():
+    breaker = CircuitBreaker(window=10, min_samples=4, latency_ms=100)
+    for _ in range(20):
+        breaker.record(0.01)
+    assert breaker.allow()
+
+
+def test_disabled_breaker_never_opens():
+    breaker = CircuitBreaker(min_samples=1, enabled=False)
+    breaker.record(10.0, failed=True)
+    assert breaker.allow()
+
+
+def test_breaker_closes_after_a_healthy_probe():
+    breaker = CircuitBreaker(lambda: None, min_samples=1, latency_ms=1000, probe_seconds=0.01)
+    breaker.record(0.0, failed=True)
+    assert not breaker.allow()
+
+    deadline = time.monotonic() + 5
+    while not breaker.allow() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert breaker.allow()
+    assert breaker.stats()["probes"] == 1
@@ -0,0 +1,568 @@
+"""
+Translation backends for SevaSahayak
+
+Route handlers and the batching scheduler only talk to the small interface
+below (load, translate_batch, info), so the inference engine can be swapped
+by configuration:
+
+    torch        AutoModelForSeq2SeqLM.generate (default)
+    ctranslate2  CTranslate2 export of the same checkpoint, optimized for CPU
+    remote       client of translation_server.py, which owns the model
+"""
+
+import http.client
+import json
+import os
+import socket
+import threading
+import time
+import urllib.parse
+from concurrent.futures import as_completed
+
+from translation_scheduler import QueueFull
+from translation_snapshot import check_snapshot
+from translation_text import TranslationProcessor, per_text_languages
+
+SOURCE_LANG = "eng_Latn"
+
+# Padded source tokens allowed in one generate call
+DEFAULT_BUCKET_MAX_TOKENS = 1024
+# Longest / shortest input length allowed in one bucket
+DEFAULT_BUCKET_MAX_RATIO = 2.0
+# Length differences up to this many tokens never start a new bucket, so short inputs
+# are not split into many tiny generate calls
+BUCKET_MIN_GAP = 8
+
+
+def plan_buckets(lengths, max_tokens=DEFAULT_BUCKET_MAX_TOKENS, max_ratio=DEFAULT_BUCKET_MAX_RATIO):
+    """
+    Group indices by token length so each bucket pads to a similar length.
+
+    Indices are sorted by length and packed greedily. A new bucket starts when
+    the padded size (items x longest item) would exceed max_tokens, or when
+    an item is more than max_ratio times (and BUCKET_MIN_GAP tokens) longer
+    than the bucket's shortest item.
+    """
+    buckets, current = [], []
+    for index in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+        shortest = lengths[current[0]] if current else 0
+        too_long = lengths[index] > max_ratio * shortest and lengths[index] - shortest > BUCKET_MIN_GAP
+        if current and ((len(current) + 1) * lengths[index] > max_tokens or too_long):
+            buckets.append(current)
+            current = []
+        current.append(index)
+    if current:
+        buckets.append(current)
+    return buckets
+
+
+def generation_kwargs(settings, input_length):
+    """
+    Resolve generation settings into generate() arguments for one bucket.
+
+    Profiles with a length_factor bound the output by the input instead of a
+    fixed max_length: max_new_tokens = input_length * length_factor + length_slack.
+    """
+    kwargs = {k: v for k, v in settings.items() if k not in ("length_factor", "length_slack")}
+    if "length_factor" in settings:
+        max_length = kwargs.pop("max_length", 256)
+        kwargs["max_new_tokens"] = min(
+            max_length,
+            int(input_length * settings["length_factor"]) + settings.get("length_slack", 8),
+        )
+    return kwargs
+
+
+def cpu_supports_bf16():
+    """True when the CPU has native bfloat16 instructions (AVX512-BF16 or AMX)"""
+    try:
+        with open('/proc/cpuinfo') as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return 'avx512_bf16' in flags or 'amx_bf16' in flags
+
+
+def apply_precision(model, precision):
+    """Convert a loaded fp32 model to the requested inference precision"""
+    import torch
+
+    model.eval()
+    if precision == 'int8':
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    if precision == 'bf16':
+        if not cpu_supports_bf16():
+            print("CPU has no native bfloat16 support, keeping fp32 weights")
+            return model
+        return model.to(torch.bfloat16)
+    if precision != 'fp32':
+        raise ValueError(f"Unknown translation precision: {precision}")
+    return model
+
+
+class TranslationBackend:
+    """Interface every translation engine implements"""
+
+    name = "base"
+
+    # Batches the scheduler may run on this backend at the same time
+    max_concurrency = 1
+
+    def __init__(self, model_name, generation_settings, bucket_max_tokens=DEFAULT_BUCKET_MAX_TOKENS,
+                 model_path=None, pipeline=None, max_concurrency=None, bucket_max_ratio=DEFAULT_BUCKET_MAX_RATIO):
+        self.model_name = model_name
+        self.generation_settings = dict(generation_settings)
+        self.bucket_max_tokens = bucket_max_tokens
+        self.bucket_max_ratio = bucket_max_ratio
+        # Local snapshot written by translation_snapshot.py; None loads from the hub cache
+        self.model_path = model_path
+        # Creation time of that snapshot, part of the version so a new checkpoint gets new cache keys
+        self.checkpoint = None
+        # StagePipeline running encode/generate/decode of buckets in overlapping stages
+        self.pipeline = pipeline
+        if max_concurrency:
+            self.max_concurrency = max_concurrency
+        self.loaded = False
+
+        self._padding_lock = threading.Lock()
+        self._padding = {"batches": 0, "buckets": 0, "tokens": 0, "slots_unbucketed": 0, "slots_bucketed": 0}
+
+    @property
+    def version(self):
+        """Identifies the engine and weights in cache keys"""
+        return f"{self.name}:{self.model_name}"
+
+    def load(self):
+        """Load weights; called once before translate_batch"""
+        raise NotImplementedError
+
+    def load_tokenizers(self, source, options):
+        """
+        Load separate tokenizers for the encode and decode stages.
+
+        IndicTrans2's as_target_tokenizer() switches the whole instance to
+        the target vocabulary. With the stages running on different threads,
+        a shared instance would tokenize English with the target vocabulary.
+        The decode stage therefore gets its own instance, which is switched to
+        target mode once and kept there.
+        """
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(source, trust_remote_code=True, **options)
+        self.target_tokenizer = AutoTokenizer.from_pretrained(source, trust_remote_code=True, **options)
+        # Entered for good; the reference keeps the context from being closed
+        self._target_mode = self.target_tokenizer.as_target_tokenizer()
+        self._target_mode.__enter__()
+
+    def pretrained_source(self):
+        """Where from_pretrained loads from: (model_path or hub id, extra kwargs)"""
+        if self.model_path:
+            manifest = check_snapshot(self.model_path, self.model_name)
+            self.checkpoint = manifest.get("created_at") or os.path.basename(os.path.normpath(self.model_path))
+            return self.model_path, {"local_files_only": True}
+        return self.model_name, {}
+
+    def close(self):
+        """Release threads and weights; called when a model swap retires this backend"""
+        if self.pipeline is not None:
+            self.pipeline.shutdown()
+        self.loaded = False
+
+    def translate_batch(self, texts, target_lang, settings=None, on_bucket=None):
+        """
+        Translate English texts, preserving order.
+
+        target_lang is one language for every text or a list with one language
+        per text; a batch may mix languages. settings overrides the default
+        generation settings (see generation_kwargs). on_bucket(indices,
+        translations) is called as each length bucket finishes.
+        """
+        raise NotImplementedError
+
+    def translate_many(self, texts, target_langs, settings=None, on_bucket=None):
+        """
+        Translate English texts into several languages at once.
+
+        Returns one {target_lang: translation} dict per text. Every (text,
+        language) pair goes into one mixed-language batch.
+        """
+        pairs = [(text, lang) for text in texts for lang in target_langs]
+        flat = self.translate_batch([text for text, _ in pairs], [lang for _, lang in pairs], settings)
+        width = len(target_langs)
+        return [dict(zip(target_langs, flat[i * width:(i + 1) * width])) for i in range(len(texts))]
+
+    def _encode(self, inputs):
+        """Tokenize tagged inputs for the engine"""
+        raise NotImplementedError
+
+    def _generate(self, encoded, kwargs):
+        """Run the model on encoded inputs; returns raw output token ids or tokens"""
+        raise NotImplementedError
+
+    def _decode(self, outputs):
+        """Detokenize raw model outputs to text"""
+        raise NotImplementedError
+
+    def _translate_buckets(self, texts, target_lang, settings, on_bucket):
+        """
+        Shared driver of the local engines.
+
+        Buckets texts of every target language by tagged source length; each
+        bucket is tagged and encoded, generated, then decoded and
+        postprocessed. With a pipeline the three steps of different buckets
+        (and of concurrent batches) overlap; without one they run in turn on
+        the calling thread.
+        """
+        settings = settings or self.generation_settings
+        langs = per_text_languages(target_lang, len(texts))
+        lengths = [
+            len(ids) for ids in self.tokenizer(
+                [self.processor.tag(text, lang) for text, lang in zip(texts, langs)]
+            )["input_ids"]
+        ]
+
+        def stages(bucket):
+            session = self.processor.session()
+            kwargs = generation_kwargs(settings, max(lengths[i] for i in bucket))
+            return (
+                lambda: self._encode(session.preprocess([texts[i] for i in bucket], [langs[i] for i in bucket])),
+                lambda encoded: self._generate(encoded, kwargs),
+                lambda outputs: session.postprocess(self._decode(outputs)),
+            )
+
+        results = [None] * len(texts)
+
+        def finish(bucket, translated):
+            for index, text in zip(bucket, translated):
+                results[index] = text
+            if on_bucket:
+                on_bucket(bucket, translated)
+
+        buckets = self.bucketed(lengths)
+        if self.pipeline is None:
+            for bucket in buckets:
+                encode, generate, decode = stages(bucket)
+                finish(bucket, decode(generate(encode())))
+        else:
+            futures = {self.pipeline.submit(*stages(bucket)): bucket for bucket in buckets}
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+        return results
+
+    def bucketed(self, lengths):
+        """Plan length buckets for one batch and record its padding savings"""
+        buckets = plan_buckets(lengths, self.bucket_max_tokens, self.bucket_max_ratio)
+        if lengths:
+            with self._padding_lock:
+                self._padding["batches"] += 1
+                self._padding["buckets"] += len(buckets)
+                self._padding["tokens"] += sum(lengths)
+                self._padding["slots_unbucketed"] += len(lengths) * max(lengths)
+                self._padding["slots_bucketed"] += sum(
+                    len(bucket) * max(lengths[i] for i in bucket) for bucket in buckets
+                )
+        return buckets
+
+    def padding_stats(self):
+        with self._padding_lock:
+            stats = dict(self._padding)
+        tokens = stats["tokens"]
+        stats["padding_ratio_before"] = round(1 - tokens / stats["slots_unbucketed"], 4) if tokens else 0.0
+        stats["padding_ratio_after"] = round(1 - tokens / stats["slots_bucketed"], 4) if tokens else 0.0
+        stats["bucket_max_tokens"] = self.bucket_max_tokens
+        stats["bucket_max_ratio"] = self.bucket_max_ratio
+        return stats
+
+    def info(self):
+        return {
+            "backend": self.name,
+            "model": self.model_name,
+            "version": self.version,
+            "loaded": self.loaded,
+            "generation_settings": self.generation_settings,
+            "model_path": self.model_path,
+            "padding": self.padding_stats(),
+            "pipeline": self.pipeline.stats() if self.pipeline else None,
+        }
+
+
+class TorchBackend(TranslationBackend):
+    """Hugging Face transformers model running on PyTorch"""
+
+    name = "torch"
+
+    def __init__(self, model_name, generation_settings, precision="fp32", **options):
+        super().__init__(model_name, generation_settings, **options)
+        self.precision = precision
+        self.model = None
+        self.tokenizer = None
+        self.target_tokenizer = None
+        self.processor = TranslationProcessor(SOURCE_LANG)
+
+    @property
+    def version(self):
+        # Tagging and postprocessing change the output, so they are part of the version
+        version = f"{self.model_name}@{self.precision}/{self.processor.name}"
+        return f"{version}#{self.checkpoint}" if self.checkpoint else version
+
+    def load(self):
+        # Imported here so non-translation endpoints start without torch
+        from transformers import AutoModelForSeq2SeqLM
+
+        source, options = self.pretrained_source()
+        self.load_tokenizers(source, options)
+        if self.model_path:
+            # Map the safetensors weights in place, in their stored dtype, instead of
+            # materializing a copy; int8 and bf16 conversion still make private copies
+            options.update(use_safetensors=True, low_cpu_mem_usage=True, torch_dtype="auto")
+        model = AutoModelForSeq2SeqLM.from_pretrained(source, trust_remote_code=True, **options)
+        self.model = apply_precision(model, self.precision)
+        self.loaded = True
+        return self
+
+    def translate_batch(self, texts, target_lang, settings=None, on_bucket=None):
+        return self._translate_buckets(texts, target_lang, settings, on_bucket)
+
+    def _encode(self, inputs):
+        return self.tokenizer(
+            inputs,
+            truncation=True,
+            padding="longest",
+            return_tensors="pt",
+            return_attention_mask=True,
+        )
+
+    def _generate(self, encoded, kwargs):
+        import torch
+
+        with torch.no_grad():
+            generated_tokens = self.model.generate(
+                **encoded,
+                use_cache=True,
+                **kwargs,
+            )
+        return generated_tokens.detach().cpu().tolist()
+
+    def _decode(self, outputs):
+        return self.target_tokenizer.batch_decode(
+            outputs,
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=True,
+        )
+
+    def close(self):
+        super().close()
+        self.model = None
+        self.tokenizer = None
+        self.target_tokenizer = None
+
+    def info(self):
+        return {**super().info(), "precision": self.precision, "processor": self.processor.name}
+
+
+class CTranslate2Backend(TranslationBackend):
+    """
+    CTranslate2 export of the IndicTrans2 checkpoint.
+
+    model_dir must hold a CTranslate2 conversion of model_name (for example
+    the CT2 release of IndicTrans2, or the output of ct2-transformers-converter);
+    the Hugging Face tokenizer of model_name is used for sub-word handling.
+    """
+
+    name = "ctranslate2"
+
+    def __init__(self, model_name, generation_settings, model_dir, compute_type="int8",
+                 inter_threads=1, intra_threads=0, **options):
+        super().__init__(model_name, generation_settings, **options)
+        self.model_dir = model_dir
+        self.compute_type = compute_type
+        self.inter_threads = inter_threads
+        self.intra_threads = intra_threads
+        self.translator = None
+        self.tokenizer = None
+        self.target_tokenizer = None
+        self.processor = TranslationProcessor(SOURCE_LANG)
+
+    @property
+    def version(self):
+        version = f"ctranslate2:{self.model_name}@{self.compute_type}/{self.processor.name}"
+        return f"{version}#{self.checkpoint}" if self.checkpoint else version
+
+    def load(self):
+        import ctranslate2
+
+        if not self.model_dir:
+            raise ValueError("TRANSLATION_CT2_MODEL_DIR must point to a CTranslate2 model")
+        source, options = self.pretrained_source()
+        self.load_tokenizers(source, options)
+        self.translator = ctranslate2.Translator(
+            self.model_dir,
+            device="cpu",
+            compute_type=self.compute_type,
+            inter_threads=self.inter_threads,
+            intra_threads=self.intra_threads,
+        )
+        self.loaded = True
+        return self
+
+    def translate_batch(self, texts, target_lang, settings=None, on_bucket=None):
+        return self._translate_buckets(texts, target_lang, settings, on_bucket)
+
+    def _encode(self, inputs):
+        return [self.tokenizer.convert_ids_to_tokens(self.tokenizer.encode(text)) for text in inputs]
+
+    def _generate(self, encoded, kwargs):
+        outputs = self.translator.translate_batch(
+            encoded,
+            beam_size=kwargs.get("num_beams", 1),
+            max_decoding_length=kwargs.get("max_new_tokens", kwargs.get("max_length", 256)),
+            min_decoding_length=kwargs.get("min_length", 0),
+            num_hypotheses=1,
+        )
+        return [output.hypotheses[0] for output in outputs]
+
+    def _decode(self, outputs):
+        return [
+            self.target_tokenizer.decode(
+                self.target_tokenizer.convert_tokens_to_ids(tokens),
+                skip_special_tokens=True,
+                clean_up_tokenization_spaces=True,
+            )
+            for tokens in outputs
+        ]
+
+    def close(self):
+        super().close()
+        self.translator = None
+        self.tokenizer = None
+        self.target_tokenizer = None
+
+    def info(self):
+        return {
+            **super().info(),
+            "processor": self.processor.name,
+            "model_dir": self.model_dir,
+            "compute_type": self.compute_type,
+            "inter_threads": self.inter_threads,
+            "intra_threads": self.intra_threads,
+        }
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP over a Unix domain socket"""
+
+    def __init__(self, socket_path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class RemoteBackend(TranslationBackend):
+    """
+    Thin client of translation_server.py.
+
+    The model lives in a separate local process, so web workers stay small
+    and a crash in inference does not take down the web app. server_url is
+    either http://host:port or unix:///path/to/socket.
+    """
+
+    name = "remote"
+
+    # Keep a few batches in flight; the server combines them across workers
+    max_concurrency = 4
+
+    def __init__(self, model_name, generation_settings, server_url, timeout=120, wait_seconds=600, **options):
+        super().__init__(model_name, generation_settings, **options)
+        self.server_url = server_url
+        self.timeout = timeout
+        self.wait_seconds = wait_seconds
+        self.remote_version = None
+
+    @property
+    def version(self):
+        # Cache keys follow the engine that actually serves the translations
+        return self.remote_version or f"remote:{self.model_name}"
+
+    def _request(self, method, path, payload=None, timeout=None):
+        url = urllib.parse.urlsplit(self.server_url)
+        timeout = timeout or self.timeout
+        if url.scheme == "unix":
+            conn = _UnixHTTPConnection(url.path, timeout)
+        else:
+            conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+
+        try:
+            body = json.dumps(payload).encode("utf-8") if payload is not None else None
+            conn.request(method, path, body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            raw = response.read()
+        finally:
+            conn.close()
+
+        try:
+            data = json.loads(raw or b"{}")
+        except ValueError:
+            data = {"error": raw.decode("utf-8", "replace")}
+        if response.status == 429:
+            raise QueueFull(
+                f"Translation server is overloaded: {data.get('error')}",
+                retry_after=int(response.getheader("Retry-After") or 1),
+            )
+        if response.status != 200:
+            raise RuntimeError(f"Translation server returned {response.status}: {data.get('error')}")
+        return data
+
+    def load(self):
+        """Wait for the inference server to finish loading its model"""
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            try:
+                health = self._request("GET", "/health", timeout=5)
+                if health.get("state") == "ready":
+                    break
+                if health.get("state") == "failed":
+                    raise RuntimeError(f"Translation server failed to load: {health.get('error')}")
+            except (OSError, http.client.HTTPException):
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Translation server at {self.server_url} is not ready")
+            time.sleep(1)
+
+        self.remote_version = self._request("GET", "/info")["version"]
+        self.loaded = True
+        return self
+
+    def translate_batch(self, texts, target_lang, settings=None, on_bucket=None):
+        data = self._request("POST", "/translate", {
+            "texts": texts,
+            "target_lang": target_lang if isinstance(target_lang, str) else list(target_lang),
+            "settings": settings or self.generation_settings,
+        })
+        return data["translations"]
+
+    def info(self):
+        info = {**super().info(), "server_url": self.server_url}
+        try:
+            info["server"] = self._request("GET", "/info", timeout=2)
+        except (OSError, http.client.HTTPException, RuntimeError) as e:
+            info["server_error"] = str(e)
+        return info
+
+
+BACKENDS = {
+    "torch": TorchBackend,
+    "ctranslate2": CTranslate2Backend,
+    "remote": RemoteBackend,
+}
+
+
+def create_backend(name, model_name, generation_settings, **options):
+    """Instantiate a backend by its configured name"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown translation backend: {name} (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name](model_name, generation_settings, **options)
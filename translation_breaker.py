@@ -0,0 +1,117 @@
+"""
+Circuit breaker around the translation model.
+
+When model latency spikes or batches start failing, waiting on the model
+stalls every results page. The breaker watches the outcome of recent
+interactive requests; once too many of them are slow or failed it
+opens, and texts missing from the cache are answered with their English
+original, marked Untranslated, so pages render at once. While open, a
+background probe translates a short text every few seconds and the breaker
+closes again as soon as a probe is fast and succeeds.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class Untranslated(str):
+    """English text served in place of a translation while the breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Opens when, over the last `window` outcomes (at least `min_samples`),
+    the share of failed or slower-than-`latency_ms` requests reaches
+    `failure_ratio`. probe_fn() runs one real translation and is called
+    every `probe_seconds` while open.
+    """
+
+    def __init__(self, probe_fn=None, window=100, min_samples=20, failure_ratio=0.5, latency_ms=3000,
+                 probe_seconds=10, enabled=True):
+        self.probe_fn = probe_fn
+        self.window = window
+        self.min_samples = min_samples
+        self.failure_ratio = failure_ratio
+        self.latency = latency_ms / 1000.0
+        self.probe_seconds = probe_seconds
+        self.enabled = enabled
+
+        self.state = "closed"
+        self.reason = None
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._prober = None
+        self._opened_at = None
+        self._counters = {"trips": 0, "probes": 0, "failed_probes": 0, "fallback_texts": 0}
+
+    def allow(self):
+        """True if texts may be sent to the model"""
+        return not self.enabled or self.state == "closed"
+
+    def record(self, seconds, failed=False):
+        """Outcome of one request: how long the caller waited on the model and whether it failed"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self.state != "closed":
+                return
+            self._outcomes.append(failed or seconds > self.latency)
+            bad = sum(self._outcomes)
+            if len(self._outcomes) < self.min_samples or bad < self.failure_ratio * len(self._outcomes):
+                return
+            self._open(f"{bad} of the last {len(self._outcomes)} requests were slow or failed")
+
+    def fallback(self, count):
+        with self._lock:
+            self._counters["fallback_texts"] += count
+
+    def _open(self, reason):
+        """Trip the breaker and start probing (lock held)"""
+        self.state = "open"
+        self.reason = reason
+        self._opened_at = time.monotonic()
+        self._counters["trips"] += 1
+        print(f"Translation circuit opened: {reason}")
+        if self.probe_fn is not None and (self._prober is None or not self._prober.is_alive()):
+            self._prober = threading.Thread(target=self._probe_loop, name="translation-breaker", daemon=True)
+            self._prober.start()
+
+    def _close(self):
+        """Let traffic through again (lock held)"""
+        self.state = "closed"
+        self.reason = None
+        self._outcomes.clear()
+        print(f"Translation circuit closed after {time.monotonic() - self._opened_at:.1f}s")
+
+    def _probe_loop(self):
+        while True:
+            time.sleep(self.probe_seconds)
+            started = time.monotonic()
+            try:
+                self.probe_fn()
+                healthy = time.monotonic() - started <= self.latency
+            except Exception as e:
+                print(f"Translation probe failed: {e}")
+                healthy = False
+
+            with self._lock:
+                self._counters["probes"] += 1
+                if healthy:
+                    self._close()
+                    return
+                self._counters["failed_probes"] += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._counters,
+                "enabled": self.enabled,
+                "state": self.state,
+                "reason": self.reason,
+                "open_seconds": round(time.monotonic() - self._opened_at, 1) if self.state == "open" else None,
+                "recent_bad": sum(self._outcomes),
+                "recent_samples": len(self._outcomes),
+                "latency_ms": self.latency * 1000.0,
+                "failure_ratio": self.failure_ratio,
+            }
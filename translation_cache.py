@@ -0,0 +1,225 @@
+"""
+Two-tier cache for IndicTrans2 translations.
+
+Hot strings live in an in-process LRU bounded by entry count and bytes;
+every translation is also written to a SQLite file so the cache survives
+restarts and is shared by workers on the same host. The file is bounded by a
+row cap and an optional age limit; the oldest rows are pruned first.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+
+# Rows written between two prunes of the disk tier
+PRUNE_INTERVAL = 1000
+
+
+def make_cache_key(text, target_lang, model_name, settings):
+    """Build a stable cache key for one (text, language, model, settings) tuple"""
+    payload = json.dumps(
+        [text, target_lang, model_name, settings or {}],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class TranslationCache:
+    """In-memory LRU in front of an on-disk SQLite store"""
+
+    def __init__(self, db_path=None, max_entries=10000, max_bytes=16 * 1024 * 1024, max_disk_entries=500000,
+                 disk_ttl_seconds=None):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # Disk tier bounds (None = unbounded)
+        self.max_disk_entries = max_disk_entries
+        self.disk_ttl_seconds = disk_ttl_seconds
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "writes": 0,
+            "disk_read_errors": 0,
+            "disk_write_errors": 0,
+            "disk_pruned": 0,
+        }
+        self._writes_since_prune = 0
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, translated TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS translations_created_at ON translations (created_at)")
+            self._db.commit()
+            with self._lock:
+                self._prune()
+
+    @staticmethod
+    def _entry_size(key, value):
+        return len(key) + len(value.encode('utf-8'))
+
+    def _remember(self, key, value):
+        """Insert into the LRU and evict until both bounds hold (lock held)"""
+        if key in self._entries:
+            self._bytes -= self._entry_size(key, self._entries.pop(key))
+        self._entries[key] = value
+        self._bytes += self._entry_size(key, value)
+
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            old_key, old_value = self._entries.popitem(last=False)
+            self._bytes -= self._entry_size(old_key, old_value)
+            self._counters["evictions"] += 1
+
+    def get_many(self, keys):
+        """Return {key: translation} for every key found in memory or on disk"""
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in found:
+                    continue
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+                    self._counters["memory_hits"] += 1
+                else:
+                    missing.append(key)
+
+            if missing and self._db is not None:
+                unique_missing = list(dict.fromkeys(missing))
+                try:
+                    # SQLite limits the number of bound parameters per statement
+                    for start in range(0, len(unique_missing), 500):
+                        chunk = unique_missing[start:start + 500]
+                        placeholders = ",".join("?" * len(chunk))
+                        rows = self._db.execute(
+                            f"SELECT key, translated FROM translations WHERE key IN ({placeholders})",
+                            chunk,
+                        ).fetchall()
+                        for key, value in rows:
+                            found[key] = value
+                            self._remember(key, value)
+                except sqlite3.Error as e:
+                    # Like a failed write: serve from memory and let the model fill the gaps
+                    self._counters["disk_read_errors"] += 1
+                    print(f"Translation cache read failed ({len(unique_missing)} keys treated as misses): {e}")
+
+            for key in missing:
+                if key in found:
+                    self._counters["disk_hits"] += 1
+                else:
+                    self._counters["misses"] += 1
+        return found
+
+    def get(self, key):
+        """Return the cached translation for key, or None"""
+        return self.get_many([key]).get(key)
+
+    def set_many(self, items):
+        """
+        Store {key: translation} in memory and on disk.
+
+        A failed disk write (e.g. the database is locked by another worker)
+        is logged and counted; the translations stay in memory.
+        """
+        if not items:
+            return
+        with self._lock:
+            for key, value in items.items():
+                self._remember(key, value)
+            self._counters["writes"] += len(items)
+
+            if self._db is not None:
+                now = time.time()
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO translations (key, translated, created_at) VALUES (?, ?, ?)",
+                        [(key, value, now) for key, value in items.items()],
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    self._db.rollback()
+                    self._counters["disk_write_errors"] += 1
+                    print(f"Translation cache write failed ({len(items)} entries kept in memory only): {e}")
+                    return
+                self._writes_since_prune += len(items)
+                if self._writes_since_prune >= PRUNE_INTERVAL:
+                    self._prune()
+
+    def _prune(self):
+        """Delete rows past the age limit, then the oldest rows over the row cap (lock held)"""
+        self._writes_since_prune = 0
+        if self.max_disk_entries is None and not self.disk_ttl_seconds:
+            return
+        try:
+            pruned = 0
+            if self.disk_ttl_seconds:
+                pruned += self._db.execute(
+                    "DELETE FROM translations WHERE created_at < ?", (time.time() - self.disk_ttl_seconds,)
+                ).rowcount
+            if self.max_disk_entries is not None:
+                excess = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0] - self.max_disk_entries
+                if excess > 0:
+                    pruned += self._db.execute(
+                        "DELETE FROM translations WHERE key IN "
+                        "(SELECT key FROM translations ORDER BY created_at, rowid LIMIT ?)",
+                        (excess,),
+                    ).rowcount
+            self._db.commit()
+            self._counters["disk_pruned"] += pruned
+        except sqlite3.Error as e:
+            self._db.rollback()
+            print(f"Translation cache prune failed: {e}")
+
+    def set(self, key, value):
+        """Store a single translation"""
+        self.set_many({key: value})
+
+    def stats(self):
+        """Counters and current size, used to size the cache"""
+        disk_entries = None
+        if self._db is not None:
+            # Counted on a separate connection, outside the lock, so lookups never wait on it
+            try:
+                with closing(sqlite3.connect(self.db_path)) as db:
+                    disk_entries = db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            except sqlite3.Error:
+                pass
+        with self._lock:
+            lookups = sum(self._counters[k] for k in ("memory_hits", "disk_hits", "misses"))
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            return {
+                **self._counters,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._entries),
+                "memory_bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "disk_entries": disk_entries,
+                "max_disk_entries": self.max_disk_entries,
+                "disk_ttl_seconds": self.disk_ttl_seconds,
+                "db_path": self.db_path,
+            }
+
+    def clear_memory(self):
+        """Drop the in-memory tier (the disk tier is kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,146 @@
+"""
+Translation configuration shared by the web app and the inference server.
+
+Settings come from environment variables so every process that owns a
+model (app.py, translation_server.py, benchmarks) builds the same backend.
+"""
+
+import os
+
+from translation_backends import create_backend
+
+TRANSLATION_MODEL_NAME = "ai4bharat/indictrans2-en-indic-1B"
+
+# Local memory-mapped snapshot of the model (python translation_snapshot.py prepare);
+# unset loads from the Hugging Face hub cache
+TRANSLATION_MODEL_DIR = os.environ.get('TRANSLATION_MODEL_DIR') or None
+
+# Inference engine: "torch" (default), "ctranslate2" (CPU-optimized export),
+# "pool" (K replica processes of TRANSLATION_POOL_ENGINE) or "remote" (thin
+# client of translation_server.py, which owns the model)
+TRANSLATION_BACKEND = os.environ.get('TRANSLATION_BACKEND', 'torch').lower()
+
+# Inference precision: "fp32" (default), "int8" (dynamic quantization of linear
+# layers, CPU only) or "bf16" (only applied when the CPU supports bfloat16)
+TRANSLATION_PRECISION = os.environ.get('TRANSLATION_PRECISION', 'fp32').lower()
+
+# Generation profiles trade output quality for latency; "quality" is the original setting.
+# "length_factor" bounds the output by the input length instead of max_length.
+# Generation settings are part of the cache key, so changing them never serves stale output
+GENERATION_PROFILES = {
+    "fast": {
+        "min_length": 0,
+        "max_length": 256,
+        "num_beams": 1,
+        "num_return_sequences": 1,
+        "length_factor": 2.0,
+        "length_slack": 8,
+    },
+    "balanced": {
+        "min_length": 0,
+        "max_length": 256,
+        "num_beams": 2,
+        "num_return_sequences": 1,
+        "length_factor": 3.0,
+        "length_slack": 16,
+    },
+    "quality": {
+        "min_length": 0,
+        "max_length": 256,
+        "num_beams": 5,
+        "num_return_sequences": 1,
+    },
+}
+GENERATION_SETTINGS = GENERATION_PROFILES["quality"]
+
+
+def auto_profile(text):
+    """Short labels use greedy decoding, sentences a small beam, long text full quality"""
+    words = len(text.split())
+    if words <= 3:
+        return "fast"
+    if words <= 16:
+        return "balanced"
+    return "quality"
+
+
+# Padded source tokens per generate call; inputs are grouped by length to limit padding
+TRANSLATION_BUCKET_MAX_TOKENS = int(os.environ.get('TRANSLATION_BUCKET_MAX_TOKENS', 1024))
+# A new bucket starts when an input is more than this many times longer than the bucket's shortest
+TRANSLATION_BUCKET_MAX_RATIO = float(os.environ.get('TRANSLATION_BUCKET_MAX_RATIO', 2.0))
+
+# Staged tokenize -> generate -> decode pipeline of the local engines; the scheduler keeps
+# TRANSLATION_PIPELINE_BATCHES batches in flight so their stages overlap
+TRANSLATION_PIPELINE = os.environ.get('TRANSLATION_PIPELINE', '1') == '1'
+TRANSLATION_PIPELINE_BATCHES = int(os.environ.get('TRANSLATION_PIPELINE_BATCHES', 2))
+
+
+def build_pipeline():
+    """StagePipeline for a local engine, or None when pipelining is off"""
+    if not TRANSLATION_PIPELINE:
+        return None
+    from translation_pipeline import StagePipeline
+
+    return StagePipeline(
+        encode_workers=int(os.environ.get('TRANSLATION_PIPELINE_ENCODE_WORKERS', 2)),
+        generate_workers=int(os.environ.get('TRANSLATION_PIPELINE_GENERATE_WORKERS', 1)),
+        decode_workers=int(os.environ.get('TRANSLATION_PIPELINE_DECODE_WORKERS', 2)),
+    )
+
+
+# Out-of-process inference server used by the "remote" backend
+TRANSLATION_SERVER_URL = os.environ.get('TRANSLATION_SERVER_URL', 'http://127.0.0.1:5055')
+
+
+def build_translation_backend(backend_name=TRANSLATION_BACKEND, precision=TRANSLATION_PRECISION,
+                              model_dir=TRANSLATION_MODEL_DIR):
+    """Create (but do not load) the configured translation backend; model_dir overrides the snapshot"""
+    if backend_name == 'remote':
+        return create_backend(
+            'remote',
+            TRANSLATION_MODEL_NAME,
+            GENERATION_SETTINGS,
+            server_url=TRANSLATION_SERVER_URL,
+            timeout=float(os.environ.get('TRANSLATION_SERVER_TIMEOUT', 120)),
+            wait_seconds=float(os.environ.get('TRANSLATION_SERVER_WAIT_SECONDS', 600)),
+        )
+    if backend_name == 'pool':
+        from translation_pool import ReplicaPool
+
+        return ReplicaPool(
+            TRANSLATION_MODEL_NAME,
+            GENERATION_SETTINGS,
+            bucket_max_tokens=TRANSLATION_BUCKET_MAX_TOKENS,
+            bucket_max_ratio=TRANSLATION_BUCKET_MAX_RATIO,
+            engine=os.environ.get('TRANSLATION_POOL_ENGINE', 'torch').lower(),
+            precision=precision,
+            replicas=int(os.environ.get('TRANSLATION_POOL_REPLICAS', 2)),
+            threads_per_replica=int(os.environ.get('TRANSLATION_POOL_THREADS', 0)) or None,
+            model_path=model_dir,
+        )
+    if backend_name == 'ctranslate2':
+        return create_backend(
+            'ctranslate2',
+            TRANSLATION_MODEL_NAME,
+            GENERATION_SETTINGS,
+            bucket_max_tokens=TRANSLATION_BUCKET_MAX_TOKENS,
+            bucket_max_ratio=TRANSLATION_BUCKET_MAX_RATIO,
+            model_dir=os.environ.get('TRANSLATION_CT2_MODEL_DIR'),
+            compute_type=os.environ.get('TRANSLATION_CT2_COMPUTE_TYPE', 'int8'),
+            model_path=model_dir,
+            pipeline=build_pipeline(),
+            max_concurrency=TRANSLATION_PIPELINE_BATCHES if TRANSLATION_PIPELINE else None,
+            inter_threads=int(os.environ.get('TRANSLATION_CT2_INTER_THREADS', 1)),
+            intra_threads=int(os.environ.get('TRANSLATION_CT2_INTRA_THREADS', 0)),
+        )
+    return create_backend(
+        backend_name,
+        TRANSLATION_MODEL_NAME,
+        GENERATION_SETTINGS,
+        bucket_max_tokens=TRANSLATION_BUCKET_MAX_TOKENS,
+        bucket_max_ratio=TRANSLATION_BUCKET_MAX_RATIO,
+        precision=precision,
+        model_path=model_dir,
+        pipeline=build_pipeline(),
+        max_concurrency=TRANSLATION_PIPELINE_BATCHES if TRANSLATION_PIPELINE else None,
+    )
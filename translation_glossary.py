@@ -0,0 +1,127 @@
+"""
+Curated glossary for the closed vocabulary of the scheme catalog.
+
+Categories ("Healthcare"), document names ("Ration Card") and scheme
+acronyms ("PM-KISAN") are a small, fixed set of strings. Exact matches are
+answered from the glossary without the model, and protected terms inside
+longer texts are masked before translation and restored afterwards, so
+beam search cannot garble proper nouns.
+
+translation_glossary.json:
+    {
+      "version": "2026-10-18",
+      "protected_terms": ["PM-KISAN", "MGNREGA", "Aadhaar"],
+      "languages": {"hin_Deva": {"Healthcare": "स्वास्थ्य सेवा", "Aadhaar": "आधार"}}
+    }
+
+A protected term is masked only for languages that have a glossary entry
+for it, and restored as that entry. In other languages the model translates
+(usually transliterates) it as before; restoring it verbatim would leave
+Latin script in the translation.
+"""
+
+import json
+import os
+import re
+import threading
+
+from translation_text import to_script_digits
+
+# Masked terms are sent to the model as numbers, which it copies through
+_SENTINEL_BASE = 8101
+
+
+class Glossary:
+    """Per-language exact-match table plus protected-term masking"""
+
+    def __init__(self, languages=None, protected_terms=None, version=None):
+        self.languages = languages or {}
+        self.protected_terms = sorted(set(protected_terms or []), key=len, reverse=True)
+        self.version = version
+        # One pattern per language, over the protected terms it has entries for
+        self._patterns = {}
+        for lang, entries in self.languages.items():
+            terms = [term for term in self.protected_terms if term in entries]
+            if terms:
+                self._patterns[lang] = re.compile(
+                    r"(?<![\w-])(" + "|".join(re.escape(term) for term in terms) + r")(?![\w-])"
+                )
+        self._lock = threading.Lock()
+        self._counters = {"exact_hits": 0, "masked_texts": 0, "masked_terms": 0, "mask_fallbacks": 0}
+
+    @classmethod
+    def load(cls, path):
+        """Load the glossary file; a missing file gives an empty glossary"""
+        if not path or not os.path.exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("languages"), data.get("protected_terms"), data.get("version"))
+
+    def lookup_many(self, texts, target_lang):
+        """
+        {text: translation} for texts that are glossary entries of target_lang.
+
+        Surrounding whitespace is ignored, so a bare protected term such as
+        " Aadhaar" is answered from its entry without the model.
+        """
+        entries = self.languages.get(target_lang, {})
+        hits = {}
+        for text in texts:
+            term = text.strip()
+            if term in entries:
+                hits[text] = entries[term]
+        if hits:
+            with self._lock:
+                self._counters["exact_hits"] += sum(1 for text in texts if text in hits)
+        return hits
+
+    def mask(self, text, target_lang):
+        """
+        Replace protected terms that have an entry for target_lang with sentinel numbers.
+
+        Returns (masked_text, restore) where restore maps each sentinel to the
+        entry it stands for; restore is empty when nothing was masked.
+        """
+        pattern = self._patterns.get(target_lang)
+        if pattern is None:
+            return text, {}
+        entries = self.languages[target_lang]
+        restore = {}
+
+        def replace(match):
+            sentinel = str(_SENTINEL_BASE + len(restore))
+            restore[sentinel] = entries[match.group(1)]
+            return sentinel
+
+        masked = pattern.sub(replace, text)
+        if restore and any(sentinel in text for sentinel in restore):
+            # The text already contains a sentinel number; leave it unmasked
+            return text, {}
+        if restore:
+            with self._lock:
+                self._counters["masked_texts"] += 1
+                self._counters["masked_terms"] += len(restore)
+        return masked, restore
+
+    def unmask(self, translated, restore, target_lang):
+        """Put protected terms back into a translation; None if the model lost a sentinel"""
+        for sentinel, term in restore.items():
+            forms = {sentinel, to_script_digits(sentinel, target_lang)}
+            found = [form for form in forms if form in translated]
+            if len(found) != 1 or translated.count(found[0]) != 1:
+                with self._lock:
+                    self._counters["mask_fallbacks"] += 1
+                return None
+            translated = translated.replace(found[0], term)
+        return translated
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "version": self.version,
+            "protected_terms": len(self.protected_terms),
+            "languages": {lang: len(entries) for lang, entries in self.languages.items()},
+        }
@@ -0,0 +1,211 @@
+"""
+Background translation jobs for bulk workloads.
+
+Re-translating the whole catalog or importing a partner's scheme list does
+not fit in a synchronous HTTP call. A job takes a list of texts (or a JSONL
+upload), returns an ID at once and is translated on a background thread
+in chunks through the same cache and batching layer as interactive
+requests, at bulk priority. Clients poll the job for progress and download
+the results as JSONL when it is done.
+
+Jobs live in memory; they do not survive a restart.
+"""
+
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from translation_scheduler import QueueFull
+
+JOB_STATES = ("queued", "running", "completed", "failed", "cancelled")
+
+
+def parse_jsonl(lines):
+    """
+    Read job items from JSONL: each line is a JSON string or an object with
+    "text" and an optional "id" (defaults to the line number).
+    """
+    items = []
+    for number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Line {number} is not valid JSON: {e}")
+        if isinstance(record, str):
+            record = {"text": record}
+        if not isinstance(record, dict) or not isinstance(record.get("text"), str):
+            raise ValueError(f"Line {number} needs a \"text\" string")
+        items.append((record.get("id", number), record["text"]))
+    return items
+
+
+class TranslationJob:
+    def __init__(self, items, target_langs, profile):
+        self.id = secrets.token_hex(8)
+        self.items = items
+        self.target_langs = target_langs
+        self.profile = profile
+        self.status = "queued"
+        self.error = None
+        self.results = []
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def total(self):
+        return len(self.items) * len(self.target_langs)
+
+    @property
+    def finished(self):
+        return self.status in ("completed", "failed", "cancelled")
+
+    def summary(self):
+        done = len(self.results)
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "target_langs": self.target_langs,
+            "profile": self.profile,
+            "texts": len(self.items),
+            "progress": {
+                "done": done,
+                "total": self.total,
+                "percent": round(100.0 * done / self.total, 1) if self.total else 100.0,
+            },
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    def result_lines(self):
+        """Translations as JSONL, one line per (text, language)"""
+        for record in self.results:
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+class TranslationJobManager:
+    """
+    Runs jobs one at a time on a background thread.
+
+    translate_fn(texts, target_lang, profile) translates one chunk; jobs are
+    fed to it chunk by chunk so at most one chunk of bulk work is queued in
+    the scheduler at any time.
+    """
+
+    def __init__(self, translate_fn, chunk_size=64, max_finished_jobs=100):
+        self.translate_fn = translate_fn
+        self.chunk_size = chunk_size
+        self.max_finished_jobs = max_finished_jobs
+
+        self._jobs = OrderedDict()
+        self._pending = []
+        self._cond = threading.Condition()
+        self._worker = None
+        self._backoffs = 0
+
+    def submit(self, items, target_langs, profile):
+        job = TranslationJob(items, target_langs, profile)
+        with self._cond:
+            self._jobs[job.id] = job
+            self._pending.append(job)
+            self._prune()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="translation-jobs", daemon=True)
+                self._worker.start()
+            self._cond.notify_all()
+        return job
+
+    def get(self, job_id):
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def counts(self):
+        """Number of kept jobs in each state"""
+        with self._cond:
+            counts = {state: 0 for state in JOB_STATES}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def cancel(self, job_id):
+        """Stop a job after its current chunk; returns the job or None"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is not None and not job.finished:
+                job.status = "cancelled"
+                job.finished_at = time.time()
+                if job in self._pending:
+                    self._pending.remove(job)
+            return job
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond max_finished_jobs (lock held)"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                job = self._pending.pop(0)
+                job.status = "running"
+                job.started_at = time.time()
+
+            try:
+                self._run_job(job)
+            except Exception as e:
+                with self._cond:
+                    job.status = "failed"
+                    job.error = str(e)
+                    job.finished_at = time.time()
+                print(f"Translation job {job.id} failed: {e}")
+
+            with self._cond:
+                self._prune()
+
+    def _run_job(self, job):
+        for target_lang in job.target_langs:
+            for start in range(0, len(job.items), self.chunk_size):
+                if job.status == "cancelled":
+                    return
+                chunk = job.items[start:start + self.chunk_size]
+                translations = self._translate_chunk(job, [text for _, text in chunk], target_lang)
+                if translations is None:
+                    return
+                with self._cond:
+                    job.results.extend(
+                        {"id": item_id, "target_lang": target_lang, "text": text, "translated": translated}
+                        for (item_id, text), translated in zip(chunk, translations)
+                    )
+
+        with self._cond:
+            if job.status == "running":
+                job.status = "completed"
+                job.finished_at = time.time()
+
+    def _translate_chunk(self, job, texts, target_lang):
+        """Translate one chunk, backing off while the scheduler sheds load; None if cancelled"""
+        while True:
+            try:
+                return self.translate_fn(texts, target_lang, job.profile)
+            except QueueFull as e:
+                with self._cond:
+                    self._backoffs += 1
+                time.sleep(e.retry_after)
+                if job.status == "cancelled":
+                    return None
+
+    def stats(self):
+        counts = self.counts()
+        with self._cond:
+            return {**counts, "chunk_size": self.chunk_size, "backoffs": self._backoffs}
@@ -0,0 +1,96 @@
+"""
+Staged tokenize -> generate -> decode pipeline for the local engines.
+
+Run one after another, the CPU-bound tokenizer and detokenizer sit idle
+while the model generates, and the other way round. The pipeline gives each
+stage its own small worker pool, so while one bucket is generating the next
+one is being tagged and tokenized and the previous one decoded and
+postprocessed. Buckets from concurrent batches share the same stages; the
+generate stage has a single worker by default, so the model still runs one
+call at a time with all of its threads.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+STAGES = ("encode", "generate", "decode")
+
+
+class StagePipeline:
+    """Chains encode, generate and decode calls through one worker pool per stage"""
+
+    def __init__(self, encode_workers=2, generate_workers=1, decode_workers=2):
+        self.workers = {"encode": encode_workers, "generate": generate_workers, "decode": decode_workers}
+        self._pools = {
+            stage: ThreadPoolExecutor(max_workers=count, thread_name_prefix=f"translation-{stage}")
+            for stage, count in self.workers.items()
+        }
+        self._lock = threading.Lock()
+        self._counters = {stage: {"items": 0, "busy_seconds": 0.0, "queued": 0} for stage in STAGES}
+        self._started = time.monotonic()
+
+    def submit(self, encode, generate, decode):
+        """
+        Run encode(), generate(encoded) and decode(generated) in their stages.
+
+        Returns a Future for the decoded result; an exception in any stage
+        fails the Future and skips the remaining stages.
+        """
+        result = Future()
+
+        def run(stage, fn, *args):
+            with self._lock:
+                self._counters[stage]["queued"] += 1
+            try:
+                future = self._pools[stage].submit(self._timed, stage, fn, *args)
+            except RuntimeError as e:
+                # Shut down (backend swapped out, or interpreter exiting): fail instead of hanging
+                with self._lock:
+                    self._counters[stage]["queued"] -= 1
+                result.set_exception(e)
+                return
+            future.add_done_callback(lambda done: advance(stage, done))
+
+        def advance(stage, done):
+            if done.exception() is not None:
+                result.set_exception(done.exception())
+            elif stage == "encode":
+                run("generate", generate, done.result())
+            elif stage == "generate":
+                run("decode", decode, done.result())
+            else:
+                result.set_result(done.result())
+
+        run("encode", encode)
+        return result
+
+    def _timed(self, stage, fn, *args):
+        started = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                counters = self._counters[stage]
+                counters["queued"] -= 1
+                counters["items"] += 1
+                counters["busy_seconds"] += time.monotonic() - started
+
+    def stats(self):
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            return {
+                stage: {
+                    **counters,
+                    "busy_seconds": round(counters["busy_seconds"], 3),
+                    "workers": self.workers[stage],
+                    # Share of wall time the stage's workers were busy
+                    "utilization": round(counters["busy_seconds"] / (elapsed * self.workers[stage]), 4)
+                    if elapsed else 0.0,
+                }
+                for stage, counters in self._counters.items()
+            }
+
+    def shutdown(self):
+        for pool in self._pools.values():
+            pool.shutdown(wait=True)
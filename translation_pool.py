@@ -0,0 +1,220 @@
+"""
+Pool of translation model replicas with per-replica thread budgets.
+
+A single torch model does not use a 32-core host well: one generate call
+cannot keep every core busy, and concurrent calls on the same intra-op
+thread pool thrash. The pool runs K replica processes, each pinned to its
+own thread budget (cores / K by default), and routes every batch to the
+replica with the fewest texts in flight.
+
+Replicas are processes rather than threads because torch's intra-op
+thread count is global to a process.
+"""
+
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from translation_backends import TranslationBackend
+
+
+def _replica_main(engine, precision, model_path, threads, requests, responses):
+    """Replica process: load one engine with a fixed thread budget and serve batches"""
+    # Must be set before torch creates its thread pools
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads)
+
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except ImportError:
+        pass
+
+    from translation_config import build_translation_backend
+
+    try:
+        backend = build_translation_backend(engine, precision, model_path).load()
+    except Exception as e:
+        responses.put(("ready", False, str(e)))
+        return
+    responses.put(("ready", True, backend.version))
+
+    while True:
+        message = requests.get()
+        if message is None:
+            return
+        request_id, texts, target_lang, settings = message
+        try:
+            responses.put((request_id, True, backend.translate_batch(texts, target_lang, settings)))
+        except Exception as e:
+            responses.put((request_id, False, str(e)))
+
+
+class _Replica:
+    def __init__(self, index, threads):
+        self.index = index
+        self.threads = threads
+        self.process = None
+        self.requests = None
+        self.responses = None
+        self.version = None
+        self.inflight_texts = 0
+        self.completed_batches = 0
+        self.completed_texts = 0
+
+
+class ReplicaPool(TranslationBackend):
+    """Least-loaded router over K replica processes"""
+
+    name = "pool"
+
+    def __init__(self, model_name, generation_settings, engine="torch", precision="fp32",
+                 replicas=2, threads_per_replica=None, **options):
+        super().__init__(model_name, generation_settings, **options)
+        if engine in ("pool", "remote"):
+            raise ValueError("Pool replicas need a local engine (torch or ctranslate2)")
+        self.engine = engine
+        self.precision = precision
+        self.threads_per_replica = threads_per_replica or max(1, (os.cpu_count() or 1) // replicas)
+        self.replicas = [_Replica(index, self.threads_per_replica) for index in range(replicas)]
+        self.max_concurrency = replicas
+
+        self._lock = threading.Lock()
+        self._futures = {}
+        self._ids = itertools.count()
+        self._collectors = []
+
+    @property
+    def version(self):
+        # All replicas load the same engine and weights
+        return self.replicas[0].version or f"pool:{self.model_name}@{self.precision}"
+
+    def load(self):
+        ctx = multiprocessing.get_context("spawn")
+        for replica in self.replicas:
+            replica.requests = ctx.Queue()
+            replica.responses = ctx.Queue()
+            replica.process = ctx.Process(
+                target=_replica_main,
+                args=(self.engine, self.precision, self.model_path, replica.threads, replica.requests, replica.responses),
+                name=f"translation-replica-{replica.index}",
+                daemon=True,
+            )
+            replica.process.start()
+
+        # Replicas load in parallel; wait for all of them
+        for replica in self.replicas:
+            while True:
+                try:
+                    _, ok, detail = replica.responses.get(timeout=1.0)
+                    break
+                except queue.Empty:
+                    if not replica.process.is_alive():
+                        ok, detail = False, f"exit code {replica.process.exitcode}"
+                        break
+            if not ok:
+                self.shutdown()
+                raise RuntimeError(f"Replica {replica.index} failed to load: {detail}")
+            replica.version = detail
+
+        for replica in self.replicas:
+            collector = threading.Thread(
+                target=self._collect, args=(replica,), name=f"translation-replica-{replica.index}-results", daemon=True
+            )
+            collector.start()
+            self._collectors.append(collector)
+
+        self.loaded = True
+        return self
+
+    def _collect(self, replica):
+        """Resolve futures with results coming back from one replica"""
+        while True:
+            try:
+                message = replica.responses.get()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+            request_id, ok, result = message
+            with self._lock:
+                future, count = self._futures.pop(request_id, (None, 0))
+                replica.inflight_texts -= count
+                replica.completed_batches += 1
+                replica.completed_texts += count
+            if future is None:
+                continue
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(RuntimeError(result))
+
+    def _least_loaded(self):
+        """Replica with the fewest texts in flight (lock held)"""
+        return min(
+            (replica for replica in self.replicas if replica.process.is_alive()),
+            key=lambda replica: replica.inflight_texts,
+            default=None,
+        )
+
+    def translate_batch(self, texts, target_lang, settings=None, on_bucket=None):
+        future = Future()
+        with self._lock:
+            replica = self._least_loaded()
+            if replica is None:
+                raise RuntimeError("No translation replica is running")
+            request_id = next(self._ids)
+            self._futures[request_id] = (future, len(texts))
+            replica.inflight_texts += len(texts)
+        replica.requests.put((request_id, texts, target_lang, settings or self.generation_settings))
+
+        # Do not wait forever on a replica that died mid-batch
+        while True:
+            try:
+                return future.result(timeout=1.0)
+            except FutureTimeout:
+                if not replica.process.is_alive():
+                    with self._lock:
+                        self._futures.pop(request_id, None)
+                        replica.inflight_texts -= len(texts)
+                    raise RuntimeError(f"Translation replica {replica.index} exited")
+
+    def shutdown(self):
+        for replica in self.replicas:
+            if replica.process is not None and replica.process.is_alive():
+                replica.requests.put(None)
+        for replica in self.replicas:
+            if replica.process is not None:
+                replica.process.join(timeout=10)
+                if replica.responses is not None:
+                    replica.responses.put(None)
+
+    def close(self):
+        self.shutdown()
+        self.loaded = False
+
+    def info(self):
+        with self._lock:
+            replicas = [
+                {
+                    "index": replica.index,
+                    "pid": replica.process.pid if replica.process else None,
+                    "alive": bool(replica.process and replica.process.is_alive()),
+                    "threads": replica.threads,
+                    "inflight_texts": replica.inflight_texts,
+                    "completed_batches": replica.completed_batches,
+                    "completed_texts": replica.completed_texts,
+                }
+                for replica in self.replicas
+            ]
+        return {
+            **super().info(),
+            "engine": self.engine,
+            "precision": self.precision,
+            "threads_per_replica": self.threads_per_replica,
+            "replicas": replicas,
+        }
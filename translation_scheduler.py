@@ -0,0 +1,422 @@
+"""
+Dynamic micro-batching for translation requests.
+
+Concurrent Flask requests submit texts to a scheduler thread, which waits a
+few milliseconds to collect work from every caller, runs one combined model
+call per generation profile and hands each caller its results. A batch may
+mix target languages; the backend groups them internally.
+Identical inputs that are already queued or running are not submitted again:
+later callers wait on the same in-flight result (singleflight).
+
+Work is queued in priority lanes (interactive before bulk) and, within a
+lane, earliest deadline first. The queue is bounded: when it is full, or
+the estimated wait for a new text is over the limit, submit raises
+QueueFull instead of letting requests pile up.
+
+Texts may also carry an expiry. Expired texts are dropped before they are
+batched, and callers that go away (client disconnected, request timed out)
+release their futures; a text nobody waits for any more is removed from
+the queue instead of being translated.
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import Future
+
+from translation_text import per_text_languages
+
+
+# Lower values run first; queued bulk work never delays interactive requests
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+# A deadline flush still waits this share of max_wait, so concurrent callers can join
+DEADLINE_MIN_WAIT_FRACTION = 0.25
+
+
+class QueueFull(Exception):
+    """The scheduler is shedding load; retry_after is a suggested wait in seconds"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(Exception):
+    """A text expired before the scheduler could batch it"""
+
+
+def estimate_tokens(text):
+    """Cheap token estimate used for batch budgeting (language tag + words)"""
+    return len(text.split()) + 2
+
+
+class _PendingItem:
+    __slots__ = ("text", "target_lang", "profile", "tokens", "priority", "deadline", "expires", "waiters",
+                 "future", "enqueued_at")
+
+    def __init__(self, text, target_lang, profile, tokens, priority, deadline, expires):
+        self.text = text
+        self.target_lang = target_lang
+        self.profile = profile
+        self.tokens = tokens
+        self.priority = priority
+        self.deadline = deadline
+        # Dropped unbatched after this time.monotonic() value (None = never)
+        self.expires = expires
+        # Callers that still want the result
+        self.waiters = 1
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+    def urgency(self):
+        """Sort key: priority lane, then earliest deadline, then arrival"""
+        return (self.priority, self.deadline if self.deadline is not None else math.inf, self.enqueued_at)
+
+
+class MicroBatcher:
+    """Collects texts from concurrent callers and runs them as combined batches"""
+
+    def __init__(self, translate_fn, max_wait_ms=10, max_batch_tokens=4096, count_tokens=estimate_tokens,
+                 concurrency=1, max_queue_items=None, max_queue_wait_ms=None):
+        self.translate_fn = translate_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_tokens = max_batch_tokens
+        self.count_tokens = count_tokens
+        # Number of batches run at the same time (one per model replica)
+        self.concurrency = concurrency
+        # Admission control: queue length bound and estimated wait bound (None = unbounded)
+        self.max_queue_items = max_queue_items
+        self.max_queue_wait = max_queue_wait_ms / 1000.0 if max_queue_wait_ms else None
+
+        self._queue = []
+        self._queued_tokens = 0
+        # Future -> item for queued and running work, so callers can release futures
+        self._items = {}
+        # Model throughput in tokens per second per worker, measured from finished batches
+        self._tokens_per_second = None
+        self._inflight = {}
+        self._cond = threading.Condition()
+        self._workers = []
+        self._closed = False
+        self._counters = {
+            "submitted": 0,
+            "coalesced": 0,
+            "batches": 0,
+            "batched_items": 0,
+            "failed_batches": 0,
+            "max_batch_size": 0,
+            "rejected": 0,
+            "deadline_flushes": 0,
+            "expired": 0,
+            "cancelled": 0,
+            "wasted_items": 0,
+            "wasted_tokens": 0,
+        }
+
+    def _ensure_workers(self):
+        """Start scheduler threads on first use, one per allowed concurrent batch (lock held)"""
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        while len(self._workers) < self.concurrency:
+            worker = threading.Thread(
+                target=self._run, name=f"translation-batcher-{len(self._workers)}", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, texts, target_lang, keys=None, profile=None, priority=PRIORITY_INTERACTIVE, deadline=None,
+               expires=None):
+        """
+        Queue texts for translation and return one Future per text.
+
+        target_lang is one language for all texts or a list with one per
+        text. Texts are only batched with texts of the same generation
+        profile; a batch may carry several target languages. translate_fn is
+        called as translate_fn(texts, target_langs, profile, on_partial) with
+        one language per text and may call on_partial(indices, results) to
+        release parts of the batch early.
+
+        keys identify identical work (defaults to the text itself); a text
+        whose key is already queued or running shares that Future.
+
+        Batches are formed from the most urgent priority class that has
+        queued work (lower runs first) and, within it, earliest deadline
+        first. deadline is a time.monotonic() value by which the caller wants
+        its results; a batch is flushed early rather than let it slip. A
+        queued text joined by a more urgent caller is promoted to that
+        caller's priority and deadline.
+
+        expires is the time.monotonic() value after which the caller no
+        longer wants the result: texts still queued then fail with
+        DeadlineExceeded instead of being batched. A shared text expires
+        only when every caller's expiry has passed.
+
+        Raises QueueFull, queueing nothing, when the texts would overflow
+        max_queue_items or their estimated wait is over max_queue_wait_ms.
+        """
+        if keys is None:
+            keys = texts
+        langs = per_text_languages(target_lang, len(texts))
+        futures = []
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Translation scheduler is shut down")
+            self._ensure_workers()
+            self._admit(sum(1 for lang, key in set(zip(langs, keys)) if (lang, profile, key) not in self._inflight),
+                        priority)
+            for text, lang, key in zip(texts, langs, keys):
+                flight_key = (lang, profile, key)
+                item = self._inflight.get(flight_key)
+                if item is not None:
+                    item.priority = min(item.priority, priority)
+                    if deadline is not None and (item.deadline is None or deadline < item.deadline):
+                        item.deadline = deadline
+                    if item.expires is not None and (expires is None or expires > item.expires):
+                        item.expires = expires
+                    item.waiters += 1
+                    self._counters["coalesced"] += 1
+                else:
+                    item = _PendingItem(text, lang, profile, self.count_tokens(text), priority, deadline, expires)
+                    self._inflight[flight_key] = item
+                    self._items[item.future] = item
+                    item.future.add_done_callback(lambda future, k=flight_key: self._land(k, future))
+                    self._queue.append(item)
+                    self._queued_tokens += item.tokens
+                    self._counters["submitted"] += 1
+                futures.append(item.future)
+            self._cond.notify_all()
+        return futures
+
+    def estimated_wait(self, priority=PRIORITY_INTERACTIVE):
+        """
+        Seconds until queued work of this priority or more urgent is done,
+        or None before the first batch has measured model throughput
+        """
+        with self._cond:
+            return self._estimated_wait(priority)
+
+    def _estimated_wait(self, priority):
+        """estimated_wait with the lock held"""
+        if not self._tokens_per_second:
+            return None
+        ahead = sum(item.tokens for item in self._queue if item.priority <= priority)
+        return ahead / (self._tokens_per_second * max(1, self.concurrency))
+
+    def _admit(self, new_items, priority):
+        """Raise QueueFull if new_items more texts at this priority should be shed (lock held)"""
+        if not new_items:
+            return
+        wait = self._estimated_wait(priority)
+        # An idle queue always admits, so one large request cannot be refused forever
+        if self.max_queue_items is not None and self._queue and len(self._queue) + new_items > self.max_queue_items:
+            reason = f"Translation queue is full ({len(self._queue)} texts queued)"
+        elif self.max_queue_wait is not None and wait is not None and wait > self.max_queue_wait:
+            reason = f"Estimated translation wait is {wait:.1f}s"
+        else:
+            return
+        self._counters["rejected"] += new_items
+        raise QueueFull(reason, retry_after=max(1, math.ceil(wait or 1)))
+
+    def _land(self, flight_key, future):
+        """Forget a finished in-flight key so later requests start fresh work"""
+        with self._cond:
+            self._inflight.pop(flight_key, None)
+            self._items.pop(future, None)
+
+    def release(self, futures):
+        """
+        The caller no longer waits for these futures (its client went away
+        or its deadline passed). Texts no other caller waits for are removed
+        from the queue and cancelled; texts already running finish and are
+        counted as wasted.
+        """
+        cancelled = []
+        with self._cond:
+            for future in futures:
+                item = self._items.get(future)
+                if item is None or item.waiters <= 0:
+                    continue
+                item.waiters -= 1
+                if item.waiters == 0 and item in self._queue:
+                    self._queue.remove(item)
+                    self._queued_tokens -= item.tokens
+                    self._counters["cancelled"] += 1
+                    cancelled.append(item)
+        for item in cancelled:
+            item.future.cancel()
+        return len(cancelled)
+
+    def has_work(self, match):
+        """True while any queued or running text has a profile for which match(profile) is true"""
+        with self._cond:
+            return any(match(item.profile) for item in self._items.values())
+
+    def translate(self, texts, target_lang, keys=None, profile=None, timeout=None, priority=PRIORITY_INTERACTIVE,
+                  deadline=None, expires=None):
+        """Blocking helper: submit texts and wait for all translations"""
+        futures = self.submit(texts, target_lang, keys, profile, priority, deadline, expires)
+        return [future.result(timeout=timeout) for future in futures]
+
+    def _head(self):
+        """Most urgent queued item: lowest priority value, then earliest deadline (lock held)"""
+        return min(self._queue, key=_PendingItem.urgency)
+
+    def _flush_at(self):
+        """
+        When the head's batch must start: max_wait after it arrived, or
+        earlier if waiting longer would make it miss its deadline (lock held)
+        """
+        head = self._head()
+        flush_at = head.enqueued_at + self.max_wait
+        if head.deadline is not None and self._tokens_per_second:
+            # Leave time to run the batch queued so far for the head's lane
+            lane_tokens = sum(
+                item.tokens for item in self._queue if item.profile == head.profile and item.priority == head.priority
+            )
+            run_seconds = min(lane_tokens, self.max_batch_tokens) / self._tokens_per_second
+            latest_start = head.deadline - run_seconds
+            if latest_start < flush_at:
+                earliest = head.enqueued_at + self.max_wait * DEADLINE_MIN_WAIT_FRACTION
+                return max(latest_start, earliest), True
+        return flush_at, False
+
+    def _drop_expired(self):
+        """Remove queued items whose expiry has passed; returns them (lock held)"""
+        now = time.monotonic()
+        expired = [item for item in self._queue if item.expires is not None and item.expires <= now]
+        if expired:
+            self._queue = [item for item in self._queue if item.expires is None or item.expires > now]
+            self._queued_tokens -= sum(item.tokens for item in expired)
+            self._counters["expired"] += len(expired)
+        return expired
+
+    def _take_batch(self):
+        """
+        Pop the next batch: the head item's priority and profile, any language,
+        most urgent first up to the token budget (lock held)
+        """
+        head = self._head()
+        profile, priority = head.profile, head.priority
+        candidates = sorted(
+            (item for item in self._queue if item.profile == profile and item.priority == priority),
+            key=_PendingItem.urgency,
+        )
+        batch, tokens = [], 0
+        for item in candidates:
+            if batch and tokens + item.tokens > self.max_batch_tokens:
+                break
+            batch.append(item)
+            tokens += item.tokens
+        taken = set(map(id, batch))
+        self._queue = [item for item in self._queue if id(item) not in taken]
+        self._queued_tokens -= tokens
+        return profile, batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+
+                # Give other requests a few milliseconds to join this batch
+                flush_at, early = self._flush_at()
+                while not self._closed and self._queued_tokens < self.max_batch_tokens:
+                    remaining = flush_at - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                    if not self._queue:
+                        break
+                    # An urgent request arriving during the wait sets a new flush time
+                    new_flush_at, new_early = self._flush_at()
+                    if new_flush_at < flush_at:
+                        flush_at, early = new_flush_at, new_early
+                if early and self._queued_tokens < self.max_batch_tokens:
+                    self._counters["deadline_flushes"] += 1
+
+                # Expired texts are dropped here, before they take a place in a batch
+                expired = self._drop_expired()
+                # Another worker may have taken the queue while this one waited
+                profile, batch = self._take_batch() if self._queue else (None, [])
+
+            for item in expired:
+                if item.future.set_running_or_notify_cancel():
+                    item.future.set_exception(DeadlineExceeded("Translation deadline passed before batching"))
+
+            # Callers may have given up on their futures while queued
+            batch = [item for item in batch if item.future.set_running_or_notify_cancel()]
+            if batch:
+                self._execute(profile, batch)
+
+    def _execute(self, profile, batch):
+        def deliver(indices, results):
+            """Resolve callers as soon as a part of the batch is done"""
+            for index, result in zip(indices, results):
+                if not batch[index].future.done():
+                    batch[index].future.set_result(result)
+
+        started = time.monotonic()
+        try:
+            results = self.translate_fn(
+                [item.text for item in batch], [item.target_lang for item in batch], profile, deliver
+            )
+        except Exception as e:
+            with self._cond:
+                self._counters["failed_batches"] += 1
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        elapsed = time.monotonic() - started
+        with self._cond:
+            if elapsed > 0:
+                # Moving average, so the wait estimate follows load and batch shape
+                rate = sum(item.tokens for item in batch) / elapsed
+                self._tokens_per_second = (
+                    rate if self._tokens_per_second is None else 0.8 * self._tokens_per_second + 0.2 * rate
+                )
+            # Texts every caller released while they ran
+            abandoned = [item for item in batch if item.waiters <= 0]
+            self._counters["wasted_items"] += len(abandoned)
+            self._counters["wasted_tokens"] += sum(item.tokens for item in abandoned)
+            self._counters["batches"] += 1
+            self._counters["batched_items"] += len(batch)
+            self._counters["max_batch_size"] = max(self._counters["max_batch_size"], len(batch))
+        deliver(range(len(batch)), results)
+
+    def stats(self):
+        with self._cond:
+            batches = self._counters["batches"]
+            return {
+                **self._counters,
+                "avg_batch_size": round(self._counters["batched_items"] / batches, 2) if batches else 0.0,
+                "queued_items": len(self._queue),
+                "queued_bulk_items": sum(1 for item in self._queue if item.priority >= PRIORITY_BULK),
+                "inflight_keys": len(self._inflight),
+                "queued_tokens": self._queued_tokens,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "max_batch_tokens": self.max_batch_tokens,
+                "concurrency": self.concurrency,
+                "max_queue_items": self.max_queue_items,
+                "max_queue_wait_ms": self.max_queue_wait * 1000.0 if self.max_queue_wait else None,
+                "tokens_per_second": round(self._tokens_per_second, 1) if self._tokens_per_second else None,
+                "estimated_wait_ms": {
+                    lane: round(wait * 1000.0, 1) if wait is not None else None
+                    for lane, wait in (
+                        ("interactive", self._estimated_wait(PRIORITY_INTERACTIVE)),
+                        ("bulk", self._estimated_wait(PRIORITY_BULK)),
+                    )
+                },
+            }
+
+    def shutdown(self):
+        """Stop accepting work; queued items are still translated"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.join()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Local translation inference server for SevaSahayak
+
+One process owns the IndicTrans2 model and every web worker started with
+TRANSLATION_BACKEND=remote sends its batches here. Memory stays flat as web
+workers are added, batches from all workers are combined, and a crash in
+inference does not take down eligibility or auth serving.
+
+    python translation_server.py                       # http://127.0.0.1:5055
+    python translation_server.py --socket /tmp/sevasahayak-translation.sock
+    TRANSLATION_PRECISION=int8 python translation_server.py
+
+Then start the web app with:
+    TRANSLATION_BACKEND=remote TRANSLATION_SERVER_URL=http://127.0.0.1:5055 gunicorn -w 4 app:app
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+from flask import Flask, request, jsonify
+
+from translation_config import TRANSLATION_BACKEND, build_translation_backend
+from translation_scheduler import MicroBatcher, QueueFull
+from translation_snapshot import describe_memory, memory_usage
+
+server = Flask(__name__)
+
+engine = None
+engine_status = {"state": "not_loaded", "error": None, "load_seconds": None}
+
+
+def load_engine(backend_name):
+    """Load the inference backend owned by this process"""
+    global engine
+    engine_status.update(state="loading", error=None)
+    started = time.time()
+    try:
+        engine = build_translation_backend(backend_name).load()
+        batcher.concurrency = engine.max_concurrency
+        memory = memory_usage()
+        engine_status.update(state="ready", load_seconds=round(time.time() - started, 2), memory=memory)
+        print(f"Translation server ready in {engine_status['load_seconds']}s ({engine.version}); {describe_memory(memory)}")
+    except Exception as e:
+        engine_status.update(state="failed", error=str(e))
+        print(f"Error loading translation model: {e}")
+
+
+def _translate(texts, target_lang, profile, on_partial):
+    # The batching profile is the JSON-encoded generation settings sent by the client
+    settings = json.loads(profile) if profile else None
+    return engine.translate_batch(texts, target_lang, settings, on_partial)
+
+
+# Batches requests from all web workers into combined model calls
+batcher = MicroBatcher(
+    _translate,
+    max_wait_ms=float(os.environ.get('TRANSLATION_BATCH_MAX_WAIT_MS', 10)),
+    max_batch_tokens=int(os.environ.get('TRANSLATION_BATCH_MAX_TOKENS', 4096)),
+    max_queue_items=int(os.environ.get('TRANSLATION_QUEUE_MAX_ITEMS', 2048)) or None,
+    max_queue_wait_ms=float(os.environ.get('TRANSLATION_QUEUE_MAX_WAIT_MS', 5000)) or None,
+)
+
+
+@server.route('/health', methods=['GET'])
+def health():
+    return jsonify(engine_status)
+
+
+@server.route('/info', methods=['GET'])
+def info():
+    if engine is None:
+        return jsonify({"error": "Translation model not loaded", **engine_status}), 503
+    return jsonify({**engine.info(), "scheduler": batcher.stats(), "pid": os.getpid()})
+
+
+@server.route('/translate', methods=['POST'])
+def translate():
+    try:
+        if engine_status["state"] != "ready":
+            return jsonify({"error": "Translation model not loaded", **engine_status}), 503
+
+        data = request.json
+        texts = data.get('texts', [])
+        # One target language for all texts, or a list with one per text
+        target_lang = data.get('target_lang', 'hin_Deva')
+        settings = data.get('settings')
+
+        if not texts:
+            return jsonify({"error": "No texts provided"}), 400
+
+        profile = json.dumps(settings, sort_keys=True) if settings else None
+        return jsonify({"translations": batcher.translate(texts, target_lang, profile=profile)})
+
+    except QueueFull as e:
+        # Web workers pass this on to their clients as 429
+        response = jsonify({"error": str(e), "retry_after": e.retry_after})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 429
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SevaSahayak translation inference server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--socket", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--backend", default=TRANSLATION_BACKEND, help="torch, ctranslate2 or pool")
+    args = parser.parse_args()
+
+    if args.backend == "remote":
+        raise SystemExit("The inference server needs a local backend (torch, ctranslate2 or pool)")
+
+    threading.Thread(target=load_engine, args=(args.backend,), name="translation-loader", daemon=True).start()
+
+    host = f"unix://{args.socket}" if args.socket else args.host
+    server.run(host=host, port=args.port, threaded=True, use_reloader=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Local, memory-mapped weight snapshots of the translation model.
+
+from_pretrained("ai4bharat/indictrans2-en-indic-1B") resolves the model
+against the Hugging Face hub cache and materializes every weight in the
+process on each start. A snapshot is a self-contained directory with the
+weights in safetensors format, the tokenizer and the model code, so it
+loads without network access. Its weights are memory-mapped rather than
+copied: startup is fast, resident memory stays low, and all processes on
+the node (web workers, the inference server, pool replicas) share the
+same page-cache pages.
+
+    python translation_snapshot.py prepare                      # needs network once
+    python translation_snapshot.py prepare --output /srv/models/indictrans2
+    python translation_snapshot.py check models/indictrans2-en-indic-1B
+
+Then start with:
+    TRANSLATION_MODEL_DIR=models/indictrans2-en-indic-1B python app.py
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+MANIFEST_FILE = "snapshot.json"
+
+
+def default_snapshot_dir(model_name):
+    return os.path.join("models", model_name.split("/")[-1])
+
+
+def prepare_snapshot(model_name, output_dir):
+    """Download model_name once and write it to output_dir as a single safetensors snapshot"""
+    import transformers
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+    started = time.time()
+    tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name, trust_remote_code=True, low_cpu_mem_usage=True)
+
+    os.makedirs(output_dir, exist_ok=True)
+    # One unsharded safetensors file, so every process maps the same file
+    model.save_pretrained(output_dir, safe_serialization=True, max_shard_size="100GB")
+    tokenizer.save_pretrained(output_dir)
+
+    manifest = {
+        "model_name": model_name,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "transformers": transformers.__version__,
+        "dtype": str(next(model.parameters()).dtype).replace("torch.", ""),
+        "files": {
+            name: os.path.getsize(os.path.join(output_dir, name))
+            for name in sorted(os.listdir(output_dir))
+        },
+        "prepare_seconds": round(time.time() - started, 1),
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def check_snapshot(path, model_name=None):
+    """Manifest of the snapshot at path; ValueError if it is missing or for another model"""
+    if not os.path.isdir(path):
+        raise ValueError(f"Model snapshot {path} does not exist; run: python translation_snapshot.py prepare --output {path}")
+    if not any(name.endswith(".safetensors") for name in os.listdir(path)):
+        raise ValueError(f"{path} has no safetensors weights; run: python translation_snapshot.py prepare --output {path}")
+
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    if model_name and manifest.get("model_name") not in (None, model_name):
+        raise ValueError(f"{path} is a snapshot of {manifest['model_name']}, not {model_name}")
+    return manifest
+
+
+def memory_usage():
+    """
+    Resident memory of this process in MB. On Linux, file_mb is the part
+    backed by mapped files (snapshot weights, shared between processes) and
+    anon_mb the private part.
+    """
+    fields = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "RssAnon", "RssFile"):
+                    fields[key] = round(int(value.split()[0]) / 1024, 1)
+    except OSError:
+        pass
+    if "VmRSS" in fields:
+        return {"rss_mb": fields["VmRSS"], "anon_mb": fields.get("RssAnon"), "file_mb": fields.get("RssFile")}
+
+    try:
+        import resource
+    except ImportError:
+        return {}
+    # Peak RSS; bytes on macOS, kilobytes elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"rss_mb": round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)}
+
+
+def describe_memory(usage=None):
+    """One-line summary of memory_usage() for startup logs"""
+    usage = usage if usage is not None else memory_usage()
+    if not usage:
+        return "RSS unknown"
+    text = f"RSS {usage['rss_mb']:.0f} MB"
+    if usage.get("file_mb") is not None:
+        text += f" ({usage['anon_mb']:.0f} MB private, {usage['file_mb']:.0f} MB mapped from files)"
+    return text
+
+
+def main():
+    from translation_config import TRANSLATION_MODEL_NAME
+
+    parser = argparse.ArgumentParser(description="Local weight snapshots of the translation model")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    prepare = commands.add_parser("prepare", help="Write a memory-mappable snapshot of the model")
+    prepare.add_argument("--model", default=TRANSLATION_MODEL_NAME)
+    prepare.add_argument("--output", help="Snapshot directory (default: models/<model>)")
+
+    check = commands.add_parser("check", help="Validate a snapshot directory")
+    check.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "prepare":
+        output = args.output or default_snapshot_dir(args.model)
+        manifest = prepare_snapshot(args.model, output)
+        size = sum(manifest["files"].values()) / (1024 * 1024)
+        print(f"Wrote {args.model} to {output} ({size:.0f} MB, {manifest['dtype']}) in {manifest['prepare_seconds']}s")
+        print(f"Start the app with TRANSLATION_MODEL_DIR={output}")
+    else:
+        try:
+            manifest = check_snapshot(args.path)
+        except ValueError as e:
+            raise SystemExit(str(e))
+        print(json.dumps(manifest, indent=2) if manifest else f"{args.path} holds safetensors weights (no manifest)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Zero-downtime replacement of the translation model.
+
+Upgrading the checkpoint or changing precision used to mean restarting the
+app and losing the warm model. A swap loads the new engine on a background
+thread while the current one keeps serving, warms it on a sample of the
+scheme catalog, then switches traffic to it in one step. Work queued for
+the old engine still runs on it (its cache keys belong to the old version);
+once none is left the old engine is closed and its memory freed.
+"""
+
+import gc
+import threading
+import time
+
+
+class SwapInProgress(Exception):
+    """Another swap has not finished yet"""
+
+
+class ModelSwapper:
+    """
+    Runs one swap at a time.
+
+    build_fn(**options) creates an unloaded backend; options left out of a
+    swap keep the value of the last successful one (initially `options`).
+    warm_fn(backend) warms it up and returns a summary, activate_fn(backend)
+    makes it the active engine and returns the previous one, and
+    busy_fn(backend) tells whether queued or running work still uses a
+    backend.
+    """
+
+    def __init__(self, build_fn, warm_fn, activate_fn, busy_fn, options=None, drain_seconds=120):
+        self.build_fn = build_fn
+        self.warm_fn = warm_fn
+        self.activate_fn = activate_fn
+        self.busy_fn = busy_fn
+        self.options = dict(options or {})
+        self.drain_seconds = drain_seconds
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self.status = {"state": "idle"}
+        self.history = []
+
+    def start(self, **options):
+        """Begin a swap in the background; raises SwapInProgress if one is running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                raise SwapInProgress(f"A model swap is already {self.status['state']}")
+            options = {**self.options, **{name: value for name, value in options.items() if value is not None}}
+            self.status = {
+                "state": "loading",
+                "options": options,
+                "started_at": time.time(),
+                "from_version": None,
+                "to_version": None,
+                "error": None,
+            }
+            self._thread = threading.Thread(target=self._swap, args=(options,), name="translation-swap", daemon=True)
+            self._thread.start()
+            return dict(self.status)
+
+    def _set(self, **fields):
+        with self._lock:
+            self.status.update(fields)
+
+    def _swap(self, options):
+        started = time.monotonic()
+        backend = activated = None
+        try:
+            backend = self.build_fn(**options).load()
+            self._set(state="warming", to_version=backend.version, load_seconds=round(time.monotonic() - started, 2))
+            print(f"Model swap: loaded {backend.version} in {self.status['load_seconds']}s, warming up")
+
+            warm_started = time.monotonic()
+            warmup = self.warm_fn(backend)
+            self._set(state="switching", warmup=warmup, warm_seconds=round(time.monotonic() - warm_started, 2))
+
+            previous = self.activate_fn(backend)
+            activated = backend
+            self.options = options
+            self._set(state="draining", from_version=previous.version if previous else None,
+                      switched_at=time.time())
+            print(f"Model swap: traffic switched to {backend.version}")
+
+            if previous is not None and previous is not backend:
+                self._retire(previous)
+            self._set(state="completed", seconds=round(time.monotonic() - started, 2))
+        except Exception as e:
+            if backend is not None and activated is None:
+                # Release the half-started engine (a pool's replica processes included)
+                backend.close()
+                gc.collect()
+            self._set(state="failed", error=str(e), seconds=round(time.monotonic() - started, 2))
+            print(f"Model swap failed, keeping the current model: {e}")
+        finally:
+            with self._lock:
+                self.history = (self.history + [dict(self.status)])[-10:]
+
+    def _retire(self, backend):
+        """Close the old engine once no queued or running work uses it"""
+        deadline = time.monotonic() + self.drain_seconds
+        while self.busy_fn(backend) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        backend.close()
+        gc.collect()
+        print(f"Model swap: released {backend.version}")
+
+    def stats(self):
+        with self._lock:
+            return {**self.status, "active_options": dict(self.options), "history": list(self.history)}
@@ -0,0 +1,204 @@
+"""
+Text handling around the translation model.
+
+Long scheme descriptions are split into sentences before translation so
+nothing is truncated at the tokenizer limit and one long text does not
+hold up a whole batch. Each sentence is translated (and cached) on its
+own, and the translations are joined back with the original spacing.
+
+TranslationProcessor adds the source and target language tags IndicTrans2
+expects and undoes its preprocessing on the model output.
+"""
+
+import re
+
+# Longest segment sent to the model; longer sentences are split at clauses
+DEFAULT_SEGMENT_MAX_WORDS = 80
+
+# Sentence end (., !, ?, Devanagari danda) plus closing quotes/brackets and
+# the whitespace after it, or a line break
+_BOUNDARY = re.compile(r'(?<=[.!?।])(["\'\)\]]*)(\s+)|(\s*\n\s*)')
+
+_ABBREVIATIONS = {
+    "e.g.", "i.e.", "etc.", "vs.", "approx.", "no.", "nos.", "rs.", "dr.", "mr.", "mrs.",
+    "ms.", "shri.", "smt.", "govt.", "dept.", "pvt.", "ltd.", "st.", "sr.", "jr.",
+}
+
+
+def _ends_with_abbreviation(text):
+    words = text.split()
+    if not words:
+        return False
+    last = words[-1].lower()
+    # Single-letter initials such as "A. P. J."
+    return last in _ABBREVIATIONS or (len(last) == 2 and last[0].isalpha() and last[1] == ".")
+
+
+def _split_long(sentence, max_words):
+    """Split a sentence over max_words at clause punctuation, then at word boundaries"""
+    pieces, current = [], []
+    for clause in re.split(r'(?<=[;:,])\s+', sentence):
+        words = clause.split()
+        if current and len(current) + len(words) > max_words:
+            pieces.append(" ".join(current))
+            current = []
+        while len(words) > max_words:
+            pieces.append(" ".join(words[:max_words]))
+            words = words[max_words:]
+        current.extend(words)
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def split_sentences(text, max_words=DEFAULT_SEGMENT_MAX_WORDS):
+    """
+    Split text into segments to translate and the spacing around them.
+
+    Returns (segments, separators) with len(separators) == len(segments) + 1:
+    separators[0] is leading whitespace, separators[-1] trailing whitespace
+    and the rest sit between segments. Text that is a single short sentence
+    comes back unchanged as ([text], ["", ""]).
+    """
+    body = text.strip()
+    sentences, gaps, start = [], [], 0
+    for match in _BOUNDARY.finditer(body):
+        closing, gap = match.group(1) or "", match.group(2) or match.group(3)
+        end = match.start() + len(closing)
+        if "\n" not in gap and _ends_with_abbreviation(body[start:end]):
+            continue
+        sentences.append(body[start:end])
+        gaps.append(gap)
+        start = match.end()
+    sentences.append(body[start:])
+
+    segments, separators = [], [text[:len(text) - len(text.lstrip())]]
+    for index, sentence in enumerate(sentences):
+        pieces = _split_long(sentence, max_words) if len(sentence.split()) > max_words else [sentence]
+        for piece_index, piece in enumerate(pieces):
+            if piece_index:
+                separators.append(" ")
+            segments.append(piece)
+        separators.append(gaps[index] if index < len(gaps) else text[len(text.rstrip()):])
+
+    if len(segments) <= 1:
+        return [text], ["", ""]
+    return segments, separators
+
+
+def join_segments(translated, separators):
+    """Rebuild a text from translated segments and the separators of split_sentences"""
+    parts = [separators[0]]
+    for segment, separator in zip(translated, separators[1:]):
+        parts.append(segment)
+        parts.append(separator)
+    return "".join(parts)
+
+
+# Code point of the digit zero of each script (target languages are <lang>_<Script>)
+_DIGIT_ZERO = {
+    "Deva": 0x0966, "Beng": 0x09E6, "Guru": 0x0A66, "Gujr": 0x0AE6, "Orya": 0x0B66,
+    "Taml": 0x0BE6, "Telu": 0x0C66, "Knda": 0x0CE6, "Mlym": 0x0D66,
+}
+
+
+def to_script_digits(text, target_lang, native_digits=True):
+    """Replace ASCII digits with the digits of the target language's script"""
+    zero = _DIGIT_ZERO.get(target_lang.rsplit("_", 1)[-1]) if native_digits else None
+    if zero is None:
+        return text
+    return "".join(chr(zero + int(ch)) if "0" <= ch <= "9" else ch for ch in text)
+
+
+def to_ascii_digits(text):
+    """Replace digits of any Indic script with ASCII digits"""
+    def ascii_digit(ch):
+        for zero in _DIGIT_ZERO.values():
+            if zero <= ord(ch) <= zero + 9:
+                return str(ord(ch) - zero)
+        return ch
+    return "".join(ascii_digit(ch) for ch in text)
+
+
+def per_text_languages(target_lang, count):
+    """A target language per text: target_lang is one language for all or a list"""
+    if isinstance(target_lang, str):
+        return [target_lang] * count
+    return list(target_lang)
+
+
+class _FallbackProcessor:
+    """Tags and whitespace normalization when IndicTransToolkit is not installed"""
+
+    def preprocess_batch(self, texts, src_lang, tgt_lang):
+        return [f"{src_lang} {tgt_lang} {' '.join(text.split())}" for text in texts]
+
+    def postprocess_batch(self, outputs, lang):
+        return [" ".join(output.split()) for output in outputs]
+
+
+class _ProcessorSession:
+    """One bucket's worth of pre/postprocessing on a single processor instance"""
+
+    def __init__(self, processor, source_lang):
+        self.processor = processor
+        self.source_lang = source_lang
+        self.groups = None
+
+    def preprocess(self, texts, target_langs):
+        """Model inputs with source and target tags, processed per target language"""
+        groups = {}
+        for index, lang in enumerate(target_langs):
+            groups.setdefault(lang, []).append(index)
+        self.groups = groups
+
+        inputs = [None] * len(texts)
+        for lang, indices in groups.items():
+            tagged = self.processor.preprocess_batch([texts[i] for i in indices], src_lang=self.source_lang, tgt_lang=lang)
+            for index, text in zip(indices, tagged):
+                inputs[index] = text
+        return inputs
+
+    def postprocess(self, outputs):
+        """Undo preprocessing (placeholders, script) in the same per-language order"""
+        results = [None] * len(outputs)
+        for lang, indices in self.groups.items():
+            for index, text in zip(indices, self.processor.postprocess_batch([outputs[i] for i in indices], lang=lang)):
+                results[index] = text
+        return results
+
+
+class TranslationProcessor:
+    """
+    IndicTrans2 input/output handling: source and target language tags,
+    normalization and entity placeholders.
+
+    Uses IndicTransToolkit's IndicProcessor when it is installed and plain
+    "src_lang tgt_lang text" tagging otherwise. IndicProcessor keeps
+    placeholders between preprocess and postprocess on the instance, so
+    every bucket gets its own session.
+    """
+
+    def __init__(self, source_lang):
+        self.source_lang = source_lang
+        try:
+            from IndicTransToolkit.processor import IndicProcessor
+        except ImportError:
+            try:
+                from IndicTransToolkit import IndicProcessor
+            except ImportError:
+                IndicProcessor = None
+        self._indic_processor = IndicProcessor
+
+    @property
+    def name(self):
+        return "IndicProcessor" if self._indic_processor else "tags"
+
+    def session(self):
+        if self._indic_processor:
+            return _ProcessorSession(self._indic_processor(inference=True), self.source_lang)
+        return _ProcessorSession(_FallbackProcessor(), self.source_lang)
+
+    def tag(self, text, target_lang):
+        """Cheap tagged form of a text, used to estimate its source length"""
+        return f"{self.source_lang} {target_lang} {text}"
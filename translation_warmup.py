@@ -0,0 +1,63 @@
+"""
+Warm-up of a freshly loaded translation model.
+
+The first translations after a load are far slower than the steady state:
+kernels are initialized lazily, the allocator grows to the largest batch
+seen so far and tokenizer caches start empty. The warm-up runs the batch
+shapes real traffic produces before the model is reported ready: short
+labels, eligibility reasons and the longest benefit texts, each as a single
+text and as one mixed batch covering every language.
+"""
+
+import time
+
+WARMUP_SHAPES = ("labels", "reasons", "benefits")
+
+
+def _spread(items, count):
+    """count items evenly spaced over items"""
+    if count >= len(items):
+        return list(items)
+    step = len(items) / count
+    return [items[int(i * step)] for i in range(count)]
+
+
+def warmup_batches(strings, reasons, langs, texts_per_shape=2):
+    """
+    [(name, texts, langs)] batches of the warm-up.
+
+    Labels are the shortest of strings, benefits the longest; every shape is
+    run once as a single text and once as texts_per_shape texts in each of
+    langs.
+    """
+    by_length = sorted(set(strings), key=lambda text: (len(text.split()), text))
+    shapes = {
+        "labels": by_length[:texts_per_shape],
+        "reasons": _spread(sorted(set(reasons)), texts_per_shape),
+        "benefits": by_length[::-1][:texts_per_shape],
+    }
+
+    batches = []
+    for shape in WARMUP_SHAPES:
+        texts = shapes[shape]
+        if not texts or not langs:
+            continue
+        batches.append((f"{shape}/single", texts[:1], list(langs[:1])))
+        pairs = [(text, lang) for lang in langs for text in texts]
+        batches.append((f"{shape}/batch", [text for text, _ in pairs], [lang for _, lang in pairs]))
+    return batches
+
+
+def run_warmup(translate_fn, batches):
+    """Translate every batch with translate_fn(texts, langs); returns how long each took"""
+    started = time.monotonic()
+    batch_ms = {}
+    for name, texts, langs in batches:
+        batch_started = time.monotonic()
+        translate_fn(texts, langs)
+        batch_ms[name] = round((time.monotonic() - batch_started) * 1000.0, 1)
+    return {
+        "translations": sum(len(texts) for _, texts, _ in batches),
+        "seconds": round(time.monotonic() - started, 2),
+        "batch_ms": batch_ms,
+    }